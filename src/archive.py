@@ -0,0 +1,118 @@
+import io
+import os
+import gzip
+import json
+import tarfile
+import zipfile
+
+from htmlnode import find_pages, render_markdown
+from template import select_template
+from compress import COMPRESSIBLE_EXTENSIONS
+from atomic import atomic_open, write_atomic
+
+ARCHIVE_EXTENSIONS = ('.tar.gz', '.tar', '.zip')
+ARCHIVE_INDEX_SUFFIX = '.index.json'
+ARCHIVE_INDEX_VERSION = 1
+# Every entry carries this timestamp so identical inputs give byte-identical archives;
+# 1980-01-01 is the earliest time a zip entry can hold
+ARCHIVE_MTIME = 315532800
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+def archive_format(path):
+    for extension in ARCHIVE_EXTENSIONS:
+        if path.endswith(extension):
+            return extension
+    raise ValueError(f"Archive name must end in {', '.join(ARCHIVE_EXTENSIONS)}, got '{path}'")
+
+class ArchiveWriter:
+    # Records where each entry's data starts so a server can read it without unpacking.
+    # Offsets in a .tar.gz index point into the decompressed tar stream
+    def __init__(self, f, extension):
+        self.f = f
+        self.extension = extension
+        self.entries = {}
+        if extension == '.zip':
+            self.zip = zipfile.ZipFile(f, 'w')
+            self.tar = None
+        else:
+            self.gzip = gzip.GzipFile(filename='', mode='wb', fileobj=f, mtime=0) if extension == '.tar.gz' else None
+            self.tar = tarfile.open(fileobj=self.gzip or f, mode='w', format=tarfile.USTAR_FORMAT)
+
+    def add(self, name, data):
+        if self.tar is not None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = ARCHIVE_MTIME
+            info.mode = 0o644
+            # The data follows the member's header blocks
+            header = info.tobuf(self.tar.format, self.tar.encoding, self.tar.errors)
+            self.entries[name] = {'offset': self.tar.offset + len(header), 'size': len(data)}
+            self.tar.addfile(info, io.BytesIO(data))
+            return
+        info = zipfile.ZipInfo(name, date_time=ARCHIVE_DATE_TIME)
+        info.external_attr = 0o644 << 16
+        # Images are already compressed; storing them keeps their bytes servable as they are
+        deflate = name.endswith(COMPRESSIBLE_EXTENSIONS)
+        info.compress_type = zipfile.ZIP_DEFLATED if deflate else zipfile.ZIP_STORED
+        self.zip.writestr(info, data)
+        self.entries[name] = {
+            'offset': self.f.tell() - info.compress_size,
+            'size': info.compress_size,
+            'length': len(data),
+            'method': 'deflate' if deflate else 'store',
+        }
+
+    def close(self):
+        if self.tar is not None:
+            self.tar.close()
+            if self.gzip is not None:
+                self.gzip.close()
+        else:
+            self.zip.close()
+
+def archive_entries(static_path, dir_path_content, template_path, layouts=None):
+    # Entry name -> (source, template); template is None for static files. Pages win over
+    # static files of the same name, as they do when ./docs is written
+    entries = {}
+    for root, dirs, files in os.walk(static_path):
+        for name in files:
+            source = os.path.join(root, name)
+            entries[os.path.relpath(source, static_path).replace(os.sep, '/')] = (source, None)
+    for content_source, content_destination in find_pages(dir_path_content, ''):
+        key = os.path.relpath(content_source, dir_path_content)
+        entries[content_destination.replace(os.sep, '/')] = (content_source, select_template(key, template_path, layouts))
+    return entries
+
+def write_archive(archive_path, static_path, dir_path_content, template_path, basepath, layouts=None):
+    # Pages are rendered in memory and written straight into the archive in name order;
+    # nothing is written to ./docs
+    extension = archive_format(archive_path)
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return []
+    entries = archive_entries(static_path, dir_path_content, template_path, layouts)
+    errors = []
+    with atomic_open(archive_path) as f:
+        writer = ArchiveWriter(f, extension)
+        for name, (source, page_template) in sorted(entries.items()):
+            try:
+                if page_template is None:
+                    with open(source, 'rb') as s:
+                        data = s.read()
+                else:
+                    with open(source, 'r', encoding='utf-8') as s:
+                        markdown = s.read()
+                    data = render_markdown(markdown, page_template, basepath, source, name).encode('utf-8')
+            except Exception as e:
+                errors.append((source, f"{type(e).__name__}: {e}"))
+                continue
+            writer.add(name, data)
+        writer.close()
+        # The index goes in place just before the archive it describes
+        write_atomic(archive_path + ARCHIVE_INDEX_SUFFIX, json.dumps({
+            'version': ARCHIVE_INDEX_VERSION,
+            'format': extension[1:],
+            'entries': writer.entries,
+        }, separators=(',', ':'), sort_keys=True))
+    print(f"Wrote {len(writer.entries)} entries to {archive_path}, {len(errors)} failed")
+    return errors
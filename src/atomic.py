@@ -0,0 +1,31 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Prefix of in-progress files; walks over output and cache directories skip them
+TEMPORARY_PREFIX = '.tmp-'
+
+# mkstemp creates files readable only by their owner; finished files get the mode open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+@contextmanager
+def atomic_open(path, mode='wb', encoding=None, times_ns=None):
+    # Every writer gets its own temporary file next to the target, so concurrent builds never
+    # write through each other; the rename makes whichever finishes last visible in one step
+    fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=TEMPORARY_PREFIX)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.chmod(temporary_path, 0o666 & ~_UMASK)
+        if times_ns is not None:
+            os.utime(temporary_path, ns=times_ns)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+        raise
+
+def write_atomic(path, data):
+    with atomic_open(path, 'wb' if isinstance(data, bytes) else 'w', None if isinstance(data, bytes) else 'utf-8') as f:
+        f.write(data)
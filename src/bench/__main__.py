@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+
+from htmlnode import markdown_to_html_node, text_to_textnodes, generate_pages_recursive
+from parallel import generate_pages_parallel
+from blocks import BlockType, parse_blocks
+from bench.corpus import SHAPES, generate_corpus
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def result(name, timings, input_bytes, pages=None):
+    best = min(timings)
+    entry = {
+        'name': name,
+        'seconds': timings,
+        'best': best,
+        'mb_per_s': input_bytes / best / 1e6,
+    }
+    if pages is not None:
+        entry['pages_per_s'] = pages / best
+    return entry
+
+def read_corpus(directory):
+    pages = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+def inline_texts(pages):
+    # Every span the renderer hands to the inline parser: paragraphs, headings, list and quote items
+    texts = []
+    for markdown in pages:
+        for block in parse_blocks(markdown.split('\n')):
+            if block.block_type != BlockType.CODE:
+                texts.extend(block.items)
+    return texts
+
+def run_benchmarks(corpus, template_path, repeat, jobs, only):
+    pages = read_corpus(corpus)
+    page_bytes = sum(len(markdown.encode('utf-8')) for markdown in pages)
+    results = []
+
+    if only in (None, 'inline'):
+        texts = inline_texts(pages)
+        text_bytes = sum(len(text.encode('utf-8')) for text in texts)
+        timings = measure(lambda: [text_to_textnodes(text) for text in texts], repeat)
+        results.append(result('text_to_textnodes', timings, text_bytes))
+
+    if only in (None, 'parse'):
+        timings = measure(lambda: [markdown_to_html_node(markdown) for markdown in pages], repeat)
+        results.append(result('markdown_to_html_node', timings, page_bytes, len(pages)))
+
+    if only in (None, 'to_html'):
+        trees = [markdown_to_html_node(markdown) for markdown in pages]
+        timings = measure(lambda: [tree.to_html() for tree in trees], repeat)
+        results.append(result('ParentNode.to_html', timings, page_bytes, len(pages)))
+
+    if only in (None, 'build'):
+        output = tempfile.mkdtemp(prefix='bench-docs-')
+        try:
+            def build():
+                shutil.rmtree(output)
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    if jobs > 1:
+                        generate_pages_parallel(corpus, template_path, output, '/', jobs)
+                    else:
+                        generate_pages_recursive(corpus, template_path, output, '/')
+            timings = measure(build, repeat)
+            name = 'generate_pages_recursive' if jobs == 1 else f'generate_pages_parallel[{jobs}]'
+            results.append(result(name, timings, page_bytes, len(pages)))
+        finally:
+            shutil.rmtree(output, ignore_errors=True)
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the site generator on a synthetic corpus")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=8000, help="approximate bytes of markdown per page")
+    parser.add_argument('--shape', choices=SHAPES, default='mixed')
+    parser.add_argument('--depth', type=int, default=2, help="directory levels above each page")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="processes for the end-to-end build")
+    parser.add_argument('--only', choices=('inline', 'parse', 'to_html', 'build'))
+    parser.add_argument('--template', default='template.html')
+    parser.add_argument('--output', help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    corpus = tempfile.mkdtemp(prefix='bench-content-')
+    try:
+        corpus_bytes = generate_corpus(corpus, args.pages, args.shape, args.page_size, args.depth, seed=args.seed)
+        results = run_benchmarks(corpus, args.template, args.repeat, args.jobs, args.only)
+    finally:
+        shutil.rmtree(corpus)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': {
+            'seed': args.seed,
+            'pages': args.pages,
+            'page_size': args.page_size,
+            'shape': args.shape,
+            'depth': args.depth,
+            'bytes': corpus_bytes,
+        },
+        'results': results,
+    }
+
+    for entry in results:
+        pages_per_s = f"{entry['pages_per_s']:10.1f} pages/s" if 'pages_per_s' in entry else ""
+        print(f"{entry['name']:32} {entry['best'] * 1000:10.2f} ms {entry['mb_per_s']:8.2f} MB/s {pages_per_s}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import random
+
+SHAPES = ('mixed', 'links', 'paragraphs', 'code')
+
+WORDS = (
+    "hobbit ring shire wizard elf dwarf mountain river forest road journey fellowship "
+    "shadow light tower king steward ranger council gate bridge song tale ancient "
+    "silver golden dark grey white green quiet swift long old young brave weary"
+).split()
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def inline_text(rng, count):
+    parts = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            parts.append(f"**{words(rng, 2)}**")
+        elif roll < 0.09:
+            parts.append(f"_{words(rng, 2)}_")
+        elif roll < 0.12:
+            parts.append(f"`{rng.choice(WORDS)}()`")
+        elif roll < 0.16:
+            parts.append(f"[{words(rng, 3)}](/{rng.choice(WORDS)}/{rng.randrange(1000)})")
+        else:
+            parts.append(rng.choice(WORDS))
+    return " ".join(parts)
+
+def paragraph(rng, count):
+    # Several source lines, joined into one paragraph by the block parser
+    lines = [inline_text(rng, 12) for _ in range(max(1, count // 12))]
+    return "\n".join(lines)
+
+def link_list(rng, items):
+    lines = []
+    for i in range(items):
+        target = f"/{rng.choice(WORDS)}/{rng.randrange(10000)}"
+        if rng.random() < 0.1:
+            lines.append(f"- ![{words(rng, 2)}]({target}.png) [{words(rng, 4)}]({target})")
+        else:
+            lines.append(f"- [{words(rng, 4)}]({target}) and [{words(rng, 2)}]({target}#{i})")
+    return "\n".join(lines)
+
+def ordered_list(rng, items):
+    return "\n".join(f"{i}. {inline_text(rng, 6)}" for i in range(1, items + 1))
+
+def quote(rng, lines):
+    return "\n".join(f"> {inline_text(rng, 10)}" for _ in range(lines))
+
+def code_block(rng, lines):
+    body = "\n".join(f"    {rng.choice(WORDS)}_{i} = {rng.choice(WORDS)}({rng.randrange(100)})" for i in range(lines))
+    return f"```\n{body}\n```"
+
+def shape_block(rng, shape):
+    if shape == 'links':
+        return link_list(rng, rng.randrange(20, 60))
+    if shape == 'paragraphs':
+        return paragraph(rng, rng.randrange(200, 600))
+    if shape == 'code':
+        return code_block(rng, rng.randrange(200, 800))
+    roll = rng.random()
+    if roll < 0.45:
+        return paragraph(rng, rng.randrange(20, 120))
+    if roll < 0.6:
+        return f"{'#' * rng.randrange(2, 5)} {words(rng, 4)}"
+    if roll < 0.75:
+        return link_list(rng, rng.randrange(3, 12))
+    if roll < 0.85:
+        return ordered_list(rng, rng.randrange(3, 10))
+    if roll < 0.93:
+        return quote(rng, rng.randrange(1, 4))
+    return code_block(rng, rng.randrange(5, 40))
+
+def generate_markdown(rng, shape='mixed', size=4000):
+    blocks = [f"# {words(rng, 5).title()}"]
+    length = len(blocks[0])
+    while length < size:
+        block = shape_block(rng, shape)
+        blocks.append(block)
+        length += len(block) + 2
+    return "\n\n".join(blocks) + "\n"
+
+def page_directory(index, depth, fanout):
+    parts = []
+    for level in range(depth):
+        parts.append(f"section{(index // fanout ** (depth - level)) % fanout}")
+    parts.append(f"page{index}")
+    return os.path.join(*parts)
+
+def generate_corpus(directory, pages=100, shape='mixed', page_size=4000, depth=2, fanout=8, seed=0):
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown corpus shape '{shape}', expected one of {', '.join(SHAPES)}")
+    rng = random.Random(seed)
+    total = 0
+    for index in range(pages):
+        path = os.path.join(directory, page_directory(index, depth, fanout), 'index.md')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        markdown = generate_markdown(rng, shape, page_size)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(markdown)
+        total += len(markdown.encode('utf-8'))
+    return total
@@ -0,0 +1,94 @@
+import re
+from enum import Enum
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+HEADING_PATTERN = re.compile(r"(#{1,6}) ")
+ORDERED_ITEM_PATTERN = re.compile(r"(\d+)\. ")
+
+class Block:
+    __slots__ = ('block_type', 'items', 'level')
+
+    def __init__(self, block_type, items, level=None):
+        self.block_type = block_type
+        self.items = items
+        self.level = level
+
+    def __eq__(self, other):
+        return (
+            self.block_type == other.block_type and
+            self.items == other.items and
+            self.level == other.level
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.items}, {self.level})"
+
+def classify_lines(lines):
+    # Lines arrive with the block already stripped as a whole, matching markdown_to_blocks
+    first = lines[0]
+
+    if len(lines) == 1:
+        heading = HEADING_PATTERN.match(first)
+        if heading:
+            return Block(BlockType.HEADING, [first.lstrip('#').lstrip()], len(heading.group(1)))
+
+    if first.startswith('> ') and all(line.startswith('> ') or line == '>' for line in lines):
+        items = [first.lstrip('> ')] + [line[1:].lstrip() for line in lines[1:]]
+        return Block(BlockType.QUOTE, items)
+
+    if all(line.startswith('- ') for line in lines):
+        return Block(BlockType.UNORDERED_LIST, [line[2:] for line in lines])
+
+    if first.startswith('1. '):
+        items = []
+        for number, line in enumerate(lines, 1):
+            item = ORDERED_ITEM_PATTERN.match(line)
+            if not item or int(item.group(1)) != number:
+                break
+            items.append(line[item.end():])
+        else:
+            return Block(BlockType.ORDERED_LIST, items)
+
+    return Block(BlockType.PARAGRAPH, [" ".join(lines)])
+
+def finish_block(lines):
+    lines[0] = lines[0].lstrip()
+    lines[-1] = lines[-1].rstrip()
+    return classify_lines(lines)
+
+def parse_blocks(lines):
+    # Accepts any iterable of lines, with or without their trailing newline, and
+    # yields each block as soon as its last line has been read
+    current = []
+    code = None
+    for line in lines:
+        line = line.rstrip('\n')
+        if code is not None:
+            if line.strip() == '```':
+                yield Block(BlockType.CODE, ["".join(code)])
+                code = None
+            else:
+                code.append(line + '\n')
+        elif line.lstrip().startswith('```') and '```' not in line.strip()[3:]:
+            if current:
+                yield finish_block(current)
+                current = []
+            code = []
+        elif line.strip() == '':
+            if current:
+                yield finish_block(current)
+                current = []
+        else:
+            current.append(line)
+
+    if code is not None:
+        yield Block(BlockType.CODE, ["".join(code)])
+    elif current:
+        yield finish_block(current)
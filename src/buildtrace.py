@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import contextlib
+
+# Handed out by span() while tracing is off so callers can fill in args unconditionally
+_discarded_args = {}
+_null_span = contextlib.nullcontext(_discarded_args)
+
+class Tracer:
+    def __init__(self):
+        # (name, start, end, pid, args); times come from perf_counter, which shares one
+        # monotonic clock across the worker processes on the same host
+        self.events = []
+        self.origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.events.append((name, start, time.perf_counter(), os.getpid(), args))
+
+_tracer = None
+
+def start_tracing():
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+def stop_tracing():
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def tracing():
+    return _tracer is not None
+
+def span(name, **args):
+    if _tracer is None:
+        return _null_span
+    return _tracer.span(name, **args)
+
+def record_events(events):
+    if _tracer is not None:
+        _tracer.events.extend(events)
+
+def phase_summary(tracer):
+    phases = {}
+    for name, start, end, pid, args in tracer.events:
+        count, total = phases.get(name, (0, 0.0))
+        phases[name] = (count + 1, total + end - start)
+    return phases
+
+def slowest_pages(tracer, limit=10):
+    pages = [event for event in tracer.events if event[0] == 'page']
+    pages.sort(key=lambda event: event[2] - event[1], reverse=True)
+    return pages[:limit]
+
+def print_report(tracer, limit=10):
+    wall = time.perf_counter() - tracer.origin
+    print(f"\n{'phase':<12} {'calls':>8} {'total ms':>12} {'mean ms':>10} {'% wall':>8}")
+    for name, (count, total) in phase_summary(tracer).items():
+        print(f"{name:<12} {count:>8} {total * 1000:>12.2f} {total * 1000 / count:>10.3f} {total / wall * 100:>7.1f}%")
+    print(f"{'wall':<12} {'':>8} {wall * 1000:>12.2f}")
+    print("(parse includes inline; with --jobs, page phases add up across workers)")
+
+    pages = slowest_pages(tracer, limit)
+    if pages:
+        print(f"\nSlowest {len(pages)} pages:")
+        for name, start, end, pid, args in pages:
+            print(f"{(end - start) * 1000:>10.2f} ms {args.get('chars_in', 0):>10} chars in {args.get('chars_out', 0):>10} out  {args.get('source')}")
+
+def write_chrome_trace(tracer, path):
+    trace_events = []
+    for name, start, end, pid, args in tracer.events:
+        trace_events.append({
+            'name': name,
+            'cat': 'build',
+            'ph': 'X',
+            'ts': (start - tracer.origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': pid,
+            'tid': pid,
+            'args': args,
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,76 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from atomic import atomic_open
+
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.svg', '.json', '.js', '.txt', '.xml')
+SIDECAR_SUFFIX = '.gz'
+
+# Sidecars that save less than this fraction of the original are not worth a second file
+MIN_SAVING = 0.1
+
+def find_compressible(directory):
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+        for name in sorted(files):
+            if not name.startswith('.') and name.endswith(COMPRESSIBLE_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return paths
+
+def find_orphaned_sidecars(directory):
+    orphans = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            source_name = name[:-len(SIDECAR_SUFFIX)]
+            # Only our own sidecars; a static foo.tar.gz has no compressible source name
+            if name.endswith(SIDECAR_SUFFIX) and source_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                if source_name not in files:
+                    orphans.append(os.path.join(root, name))
+    return orphans
+
+def gzip_bytes(data):
+    # No file name and a zero timestamp keep the output reproducible between builds
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS, 9)
+    return compressor.compress(data) + compressor.flush()
+
+def remove_sidecar(sidecar):
+    try:
+        os.unlink(sidecar)
+    except FileNotFoundError:
+        pass
+
+def compress_file(path):
+    sidecar = path + SIDECAR_SUFFIX
+    stat = os.stat(path)
+    try:
+        sidecar_stat = os.stat(sidecar)
+    except FileNotFoundError:
+        sidecar_stat = None
+    # Sidecars carry their source's mtime, so an unchanged source needs no recompression
+    if sidecar_stat is not None and sidecar_stat.st_mtime_ns == stat.st_mtime_ns:
+        return 'current'
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    compressed = gzip_bytes(data)
+    if len(compressed) > len(data) * (1 - MIN_SAVING):
+        remove_sidecar(sidecar)
+        return 'skipped'
+
+    with atomic_open(sidecar, times_ns=(stat.st_atime_ns, stat.st_mtime_ns)) as f:
+        f.write(compressed)
+    return 'compressed'
+
+def compress_outputs(directory, jobs=1):
+    for orphan in find_orphaned_sidecars(directory):
+        remove_sidecar(orphan)
+    paths = find_compressible(directory)
+    counts = {'compressed': 0, 'current': 0, 'skipped': 0}
+    # zlib releases the GIL while it compresses, so threads use every core without pickling file contents
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for status in executor.map(compress_file, paths):
+            counts[status] += 1
+    print(f"Compressed outputs in {directory}: {counts['compressed']} written, {counts['current']} current, {counts['skipped']} not worth compressing")
+    return counts
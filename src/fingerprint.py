@@ -0,0 +1,87 @@
+import os
+import re
+import shutil
+import hashlib
+import posixpath
+
+from incremental import hash_file, load_manifest, save_manifest, remove_output
+from sync import find_assets
+from render import split_url
+
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+ASSET_MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'")]+?)\1\s*\)""")
+
+def fingerprint_name(relative, digest):
+    # images/tom.png -> images/tom.0123456789.png
+    root, extension = posixpath.splitext(relative)
+    return f"{root}.{digest[:HASH_LENGTH]}{extension}"
+
+def rewrite_css(text, css_url, assets):
+    directory = posixpath.dirname(css_url)
+
+    def replace(match):
+        quote, url = match.group(1), match.group(2)
+        path, suffix = split_url(url)
+        if path == '' or ':' in path or path.startswith('//'):
+            return match.group()
+        target = posixpath.normpath(posixpath.join(directory, path))
+        if target not in assets:
+            return match.group()
+        hashed = assets[target]
+        if not path.startswith('/'):
+            hashed = posixpath.relpath(hashed, directory)
+        return f"url({quote}{hashed}{suffix}{quote})"
+
+    return CSS_URL_PATTERN.sub(replace, text)
+
+def fingerprint_assets(source, destination):
+    if not os.path.exists(source):
+        print(f"Error: Source directory not found at '{source}'")
+        return {}
+    os.makedirs(destination, exist_ok=True)
+    manifest_path = os.path.join(destination, ASSET_MANIFEST_NAME)
+    previous = load_manifest(manifest_path, ASSET_MANIFEST_VERSION)
+
+    relatives = [relative.replace(os.sep, '/') for relative in find_assets(source)]
+    # Stylesheets are hashed after their url() references are rewritten, so a changed
+    # image also changes the name of every stylesheet that points at it
+    relatives.sort(key=lambda relative: relative.endswith('.css'))
+    assets = {}
+    written = 0
+    for relative in relatives:
+        source_path = os.path.join(source, relative)
+        if relative.endswith('.css'):
+            with open(source_path, 'r', encoding='utf-8') as f:
+                data = rewrite_css(f.read(), '/' + relative, assets).encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+        else:
+            data = None
+            digest = hash_file(source_path)
+        hashed = fingerprint_name(relative, digest)
+        assets['/' + relative] = '/' + hashed
+
+        # Fingerprinted names are content addressed, so an existing file is already current
+        dest_path = os.path.join(destination, hashed)
+        if os.path.exists(dest_path):
+            continue
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        if data is None:
+            shutil.copy2(source_path, dest_path)
+        else:
+            with open(dest_path, 'wb') as f:
+                f.write(data)
+        written += 1
+
+    current = set(assets.values())
+    removed = 0
+    for hashed in ({} if previous is None else previous['assets']).values():
+        if hashed not in current:
+            remove_output(os.path.join(destination, hashed[1:]), destination)
+            removed += 1
+
+    save_manifest(manifest_path, {'version': ASSET_MANIFEST_VERSION, 'assets': assets})
+    print(f"Fingerprinted {source} into {destination}: {written} written, {removed} removed, {len(assets) - written} unchanged")
+    return assets
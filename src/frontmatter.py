@@ -0,0 +1,139 @@
+import os
+import html
+import hashlib
+
+FRONT_MATTER_FENCE = '---'
+# A leading "---" without a closing fence this soon is a thematic break, not front matter
+MAX_FRONT_MATTER_LINES = 200
+
+def parse_scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+def parse_front_matter(lines):
+    # The subset of YAML that page headers need: "key: value", "key: [a, b]" and "- item" lists
+    meta = {}
+    key = None
+    for line in lines:
+        stripped = line.strip()
+        if stripped == '' or stripped.startswith('#'):
+            continue
+        if stripped.startswith('- ') and key is not None and isinstance(meta[key], list):
+            meta[key].append(parse_scalar(stripped[2:]))
+            continue
+        name, separator, value = stripped.partition(':')
+        if separator == '' or name.strip() == '':
+            raise ValueError(f"Front matter lines must look like 'key: value', got '{stripped}'")
+        key = name.strip().lower()
+        value = value.strip()
+        if value == '':
+            meta[key] = []
+        elif value.startswith('[') and value.endswith(']'):
+            meta[key] = [parse_scalar(item) for item in value[1:-1].split(',') if item.strip()]
+        else:
+            meta[key] = parse_scalar(value)
+    return meta
+
+def read_front_matter(lines):
+    # Consumes only the header from an iterator of lines. Returns the metadata and the lines
+    # that were read but belong to the body, which callers put back in front of the rest
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return {}, []
+    if first.rstrip('\r\n') != FRONT_MATTER_FENCE:
+        return {}, [first]
+    header = []
+    for line in lines:
+        if line.rstrip('\r\n') == FRONT_MATTER_FENCE:
+            try:
+                return parse_front_matter(header), []
+            except ValueError:
+                # Two thematic breaks around ordinary text; the page has no front matter
+                return {}, [first] + header + [line]
+        header.append(line)
+        if len(header) > MAX_FRONT_MATTER_LINES:
+            break
+    return {}, [first] + header
+
+def split_front_matter(markdown):
+    if not markdown.startswith(FRONT_MATTER_FENCE):
+        return {}, markdown
+    lines = iter(markdown.splitlines(keepends=True))
+    meta, pending = read_front_matter(lines)
+    if pending:
+        return {}, markdown
+    return meta, "".join(lines)
+
+def collection_prefix(meta):
+    prefix = meta.get('collection')
+    if isinstance(prefix, list):
+        raise ValueError(f"Front matter 'collection' must be one path, got a list: {prefix}")
+    return prefix or None
+
+class MetadataIndex:
+    def __init__(self, dir_path_content, entries):
+        self.content = dir_path_content
+        # Relative source path -> {'title', 'date', 'tags', 'url', 'collection'}
+        self.entries = entries
+
+    def key(self, source):
+        return os.path.relpath(source, self.content).replace(os.sep, '/')
+
+    def collection(self, prefix, exclude=None):
+        # Newest first; undated entries go last, in title order
+        prefix = prefix.strip('/') + '/'
+        members = [
+            entry for key, entry in self.entries.items()
+            if key.startswith(prefix) and key != exclude
+        ]
+        members.sort(key=lambda entry: entry['title'] or '')
+        members.sort(key=lambda entry: entry['date'] or '', reverse=True)
+        return members
+
+    def collection_digest(self, prefix, exclude=None):
+        digest = hashlib.sha256()
+        for entry in self.collection(prefix, exclude):
+            digest.update(repr(sorted(entry.items())).encode('utf-8'))
+        return digest.hexdigest()
+
+def collection_html(entries, context):
+    items = []
+    for entry in entries:
+        title = html.escape(entry['title'] or entry['url'])
+        item = f'<li><a href="{html.escape(context.resolve_url(entry["url"]))}">{title}</a>'
+        if entry['date']:
+            item += f' <time datetime="{html.escape(entry["date"])}">{html.escape(entry["date"])}</time>'
+        items.append(item + '</li>\n')
+    return '<ul class="collection">\n' + "".join(items) + '</ul>\n'
+
+def page_values(meta, from_path, context):
+    # Template values that come from front matter; empty when a page has none
+    tags = meta.get('tags', [])
+    values = {
+        'Date': html.escape(str(meta.get('date', ''))),
+        'Tags': html.escape(", ".join(tags) if isinstance(tags, list) else str(tags)),
+        'Collection': '',
+    }
+    prefix = collection_prefix(meta)
+    if prefix and _index is not None:
+        values['Collection'] = collection_html(_index.collection(prefix, _index.key(from_path)), context)
+    return values
+
+def apply_title(meta, context):
+    # An explicit title wins over the first h1
+    if meta.get('title'):
+        context.title = html.escape(str(meta['title']))
+
+# Metadata index used while rendering, set once per process like the parse cache
+_index = None
+
+def configure_metadata(index):
+    global _index
+    _index = index
+    return _index
+
+def active_metadata():
+    return _index
@@ -1,9 +1,21 @@
 import re
 import os
 import shutil
+import marshal
+import itertools
+from types import MappingProxyType
+from collections.abc import Mapping
 
 from textnode import TextType, TextNode
-from enum import Enum
+from inline import parse_inline
+from blocks import BlockType, parse_blocks
+from template import Template, select_template
+from buildtrace import span, tracing
+from render import RenderContext, URL_PROPS, active_assets, active_images, asset_template
+from parsecache import active_parse_cache
+from linkcheck import collecting, record_links
+from searchterms import indexing, record_terms, record_title
+from frontmatter import read_front_matter, split_front_matter, page_values, apply_title
 
 def delete_directory(directory_path):
     if not os.path.exists(directory_path):
@@ -53,85 +65,130 @@ def prepare_directory(source, destination):
     copy_directory(source, destination)
     return
 
-class BlockType(Enum):
-    PARAGRAPH = "paragraph"
-    HEADING = "heading"
-    CODE = "code"
-    QUOTE = "quote"
-    UNORDERED_LIST = "unordered_list"
-    ORDERED_LIST = "ordered_list"
+# Shared by every node created with empty props
+EMPTY_PROPS = ()
 
 class HTMLNode:
+    # Pages create a node per inline span, so nodes carry no per-instance __dict__ and
+    # keep their props as a tuple of (key, value) pairs
+    __slots__ = ('tag', 'value', 'children', '_props')
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
         self.children = children
         self.props = props
+
+    @property
+    def props(self):
+        # Read-only: the pairs live in a tuple, so changes go through the setter
+        if self._props is None:
+            return None
+        return MappingProxyType(dict(self._props))
+
+    @props.setter
+    def props(self, props):
+        if props is None:
+            self._props = None
+        elif isinstance(props, Mapping):
+            self._props = tuple(props.items()) if props else EMPTY_PROPS
+        else:
+            self._props = tuple(props) if props else EMPTY_PROPS
         
-    def to_html(self):
+    def to_html(self, context=None):
         raise NotImplementedError
     
-    def props_to_html(self):
-        if self.props != None and self.props != {}:
-            formatted = ""
-            for key in self.props.keys():
-                formatted += f' {key}="{self.props[key]}"' 
-            return formatted
-        else:
+    def props_to_html(self, context=None):
+        if not self._props:
             return ""
+        if context is None:
+            return "".join([f' {key}="{value}"' for key, value in self._props])
+        resolve_url = context.resolve_url
+        return "".join([
+            f' {key}="{resolve_url(value) if key in URL_PROPS else value}"' for key, value in self._props
+        ])
 
     def __repr__(self):
-        return f"HTMLNode \n Tag: {self.tag}, Value: {self.value}, Children: {self.children}, Props: {self.props}"    
+        return f"HTMLNode \n Tag: {self.tag}, Value: {self.value}, Children: {self.children}, Props: {None if self._props is None else dict(self._props)}"    
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
         
-    def to_html(self):
+    def to_html(self, context=None):
         if self.value == None:
             raise ValueError
         if self.tag == None:
             return self.value
-        return "<" + self.tag + self.props_to_html() + ">" + self.value + "</" + self.tag + ">"
+        attributes = self.props_to_html(context)
+        if self.tag == 'img' and context is not None and context.images is not None:
+            attributes += context.image_attributes(dict(self._props or EMPTY_PROPS).get('src', ''))
+        return "<" + self.tag + attributes + ">" + self.value + "</" + self.tag + ">"
 
     def __repr__(self):
-        return f"LeafNode \n Tag: {self.tag}, Value: {self.value}, Props: {self.props}"    
+        return f"LeafNode \n Tag: {self.tag}, Value: {self.value}, Props: {None if self._props is None else dict(self._props)}"    
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
         
-    def to_html(self):
+    def to_html(self, context=None):
         if self.tag == None:
             raise ValueError("tag missing in parent node")
         elif self.children == None:
             raise ValueError("children missing in parent node")
 
-        output = "<" + self.tag + ">"
-        for child in self.children:
-            output += child.to_html()
-        output += f"</{self.tag}>\n"
-        
-        return output
+        return "".join(html_chunks(self, context))
 
     def __repr__(self):
-        return f"ParentNode \n Tag: {self.tag}, Children: {self.children}, Props: {self.props}"    
+        return f"ParentNode \n Tag: {self.tag}, Children: {self.children}, Props: {None if self._props is None else dict(self._props)}"    
+
+def html_chunks(node, context=None):
+    # Walks the tree with an explicit stack so deep trees never hit the recursion limit;
+    # closing tags are pushed as plain strings below their children
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, ParentNode):
+            if item.tag == None:
+                raise ValueError("tag missing in parent node")
+            elif item.children == None:
+                raise ValueError("children missing in parent node")
+            yield "<" + item.tag + item.props_to_html(context) + ">"
+            stack.append(f"</{item.tag}>\n")
+            stack.extend(reversed(item.children))
+        else:
+            yield item.to_html(context)
+
+def write_html(node, out, context=None):
+    write = out.append if isinstance(out, list) else out.write
+    for chunk in html_chunks(node, context):
+        write(chunk)
+
+# Text type -> (leaf tag, name of the prop that carries the url)
+TEXT_NODE_LEAVES = {
+    TextType.PLAIN: (None, None),
+    TextType.BOLD: ("b", None),
+    TextType.ITALIC: ("i", None),
+    TextType.CODE: ("code", None),
+    TextType.LINK: ("a", "href"),
+    TextType.IMAGE: ("img", "src"),
+}
 
 def text_node_to_html_node(text_node):
-    if text_node.text_type == TextType.PLAIN:
-        return LeafNode(None, text_node.text)
-    elif text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    elif text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href" : text_node.url})
-    elif text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", text_node.text , {"src" : text_node.url})
-    else:
+    leaf = TEXT_NODE_LEAVES.get(text_node.text_type)
+    if leaf is None:
         raise ValueError("LeafType unknown")
+    tag, url_prop = leaf
+    if url_prop is None:
+        return LeafNode(tag, text_node.text)
+    return LeafNode(tag, text_node.text, ((url_prop, text_node.url),))
     
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     node_list = []
@@ -204,14 +261,9 @@ def split_nodes_link(old_nodes):
     return node_list
 
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.PLAIN)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_image(nodes)
-    return nodes
+    # The split_nodes_* functions above are kept for callers that compose them by hand;
+    # page rendering goes through the single-pass tokenizer
+    return parse_inline(text)
 
 def markdown_to_blocks(markdown):
     sections = markdown.split("\n\n")
@@ -241,49 +293,115 @@ def block_to_block_type(block):
     return BlockType.PARAGRAPH
 
 def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
-    html_nodes = []
-    for text_node in text_nodes:
-        html_nodes.append(text_node_to_html_node(text_node))
+    with span('inline'):
+        text_nodes = text_to_textnodes(text)
+        html_nodes = []
+        for text_node in text_nodes:
+            html_nodes.append(text_node_to_html_node(text_node))
     return html_nodes
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    block_nodes = []
-    for block in blocks:
-        if block_to_block_type(block) == BlockType.PARAGRAPH:
-            block = block.replace('\n',' ')
-            block_nodes.append(ParentNode('p', text_to_children(block)))
-        elif block_to_block_type(block) == BlockType.HEADING:
-            heading_type = str(len(re.findall(r"\#+ ", block)[0].strip()))
-            block_nodes.append(ParentNode(f'h{heading_type}', text_to_children(block.lstrip('#').lstrip())))
-        elif block_to_block_type(block) == BlockType.CODE:
-            block = block.lstrip('```').rstrip('```').lstrip()
-            block_nodes.append(ParentNode('pre',[ParentNode('code', [LeafNode(None, block)])]))
-        elif block_to_block_type(block) == BlockType.ORDERED_LIST:
-            block = block.lstrip('1. ')
-            item_sequence = re.split(r"\n\d+\. ", block)
-            sequence_nodes = []
-            for item in item_sequence:
-                sequence_nodes.append(ParentNode('li',text_to_children(item)))
-            block_nodes.append(ParentNode('ol', sequence_nodes))
-        elif block_to_block_type(block) == BlockType.UNORDERED_LIST:
-            block = block.lstrip('- ')
-            item_sequence = block.split("\n- ")
-            sequence_nodes = []
-            for item in item_sequence:
-                sequence_nodes.append(ParentNode('li',text_to_children(item)))
-            block_nodes.append(ParentNode('ul', sequence_nodes))
-        elif block_to_block_type(block) == BlockType.QUOTE:
-            block = block.lstrip('> ')
-            item_sequence = block.split("\n>")
-            sequence_nodes = []
-            for item in item_sequence:
-                item = item.lstrip()
-                sequence_nodes.extend(text_to_children(item))
-            block_nodes.append(ParentNode('blockquote', sequence_nodes))
-        
-    return ParentNode('div', block_nodes)
+def block_to_html_node(block, context=None):
+    block_type = block.block_type
+    if block_type == BlockType.PARAGRAPH:
+        return ParentNode('p', text_to_children(block.items[0]))
+    elif block_type == BlockType.HEADING:
+        children = text_to_children(block.items[0])
+        if context is None:
+            return ParentNode(f'h{block.level}', children)
+        if block.level == 1 and context.title is None and children:
+            context.title = "".join([child.to_html(context) for child in children])
+        # The id is the anchor link checks resolve "#fragment" against
+        heading_id = context.heading_id("".join([child.value for child in children]))
+        return ParentNode(f'h{block.level}', children, None if heading_id is None else {'id': heading_id})
+    elif block_type == BlockType.CODE:
+        return ParentNode('pre', [ParentNode('code', [LeafNode(None, block.items[0])])])
+    elif block_type == BlockType.ORDERED_LIST:
+        return ParentNode('ol', [ParentNode('li', text_to_children(item)) for item in block.items])
+    elif block_type == BlockType.UNORDERED_LIST:
+        return ParentNode('ul', [ParentNode('li', text_to_children(item)) for item in block.items])
+    elif block_type == BlockType.QUOTE:
+        sequence_nodes = []
+        for item in block.items:
+            sequence_nodes.extend(text_to_children(item))
+        return ParentNode('blockquote', sequence_nodes)
+    raise ValueError(f"Unknown block type {block_type}")
+
+def markdown_to_html_node(markdown, context=None):
+    # Heading ids are numbered per document, so a whole document always gets a context
+    if context is None:
+        context = RenderContext()
+    return ParentNode('div', [block_to_html_node(block, context) for block in parse_blocks(markdown.split('\n'))])
+
+# Record kinds in the flat encoding produced by encode_tree
+PARENT_RECORD = 0
+LEAF_RECORD = 1
+
+def encode_tree(node):
+    # Pre-order and flat, four fields per node, so neither side recurses:
+    # kind, tag, child count (parents) or value (leaves), props
+    records = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if type(item) is ParentNode:
+            records.extend((PARENT_RECORD, item.tag, len(item.children), item._props))
+            stack.extend(reversed(item.children))
+        elif type(item) is LeafNode:
+            records.extend((LEAF_RECORD, item.tag, item.value, item._props))
+        else:
+            raise TypeError(f"Cannot encode {type(item).__name__}")
+    return marshal.dumps(records)
+
+def decode_tree(data):
+    records = marshal.loads(data)
+    root = None
+    # Each entry is [children list being filled, children still expected]
+    open_parents = []
+    for index in range(0, len(records), 4):
+        kind, tag, payload, props = records[index:index + 4]
+        if kind == PARENT_RECORD:
+            node = ParentNode(tag, [], props)
+        else:
+            node = LeafNode(tag, payload, props)
+        if open_parents:
+            open_parents[-1][0].append(node)
+            open_parents[-1][1] -= 1
+        else:
+            root = node
+        if kind == PARENT_RECORD and payload > 0:
+            open_parents.append([node.children, payload])
+        while open_parents and open_parents[-1][1] == 0:
+            open_parents.pop()
+    return root
+
+def tree_title(node, context):
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if item.tag == 'h1' and item.children:
+            return "".join([child.to_html(context) for child in item.children])
+        if item.children:
+            stack.extend(reversed(item.children))
+    return None
+
+def parse_markdown(markdown, context):
+    cache = active_parse_cache()
+    if cache is None:
+        return markdown_to_html_node(markdown, context)
+    key = cache.key(markdown)
+    data = cache.get(key)
+    if data is not None:
+        try:
+            node = decode_tree(data)
+        except (ValueError, EOFError, TypeError, IndexError):
+            node = None
+        if node is not None:
+            if context.title is None:
+                context.title = tree_title(node, context)
+            return node
+    node = markdown_to_html_node(markdown, context)
+    cache.put(key, encode_tree(node))
+    return node
 
 def extract_title(html):
     titles = re.findall(r"\<h1\>(.+)\<\/h1\>", html)
@@ -292,60 +410,204 @@ def extract_title(html):
     else: 
         return titles[0]
 
+def page_title(context):
+    if context.title is None:
+        raise Exception('No title found')
+    return context.title
+
+def write_page(node, context, template, out, values=None):
+    def write_content(write):
+        for chunk in html_chunks(node, context):
+            write(chunk)
+
+    template_values = dict(values or {})
+    template_values.update({"Title": page_title(context), "Content": write_content, "Basepath": context.basepath})
+    template.render(template_values, out)
+
+# A streamed page without a front matter title must reach its h1 within this much markdown
+STREAMING_TITLE_LIMIT = 64 * 1024
+
+def stream_page(lines, context, template, values=None, on_node=None):
+    # Converts blocks only up to the first h1 so the title is known before anything is
+    # written; the returned writer converts and writes every remaining block one at a time.
+    # on_node sees each block's node, since there is never a whole tree to inspect
+    blocks = parse_blocks(lines)
+    head = []
+    head_size = 0
+    while context.title is None:
+        block = next(blocks, None)
+        if block is None:
+            break
+        head_size += sum(map(len, block.items))
+        if head_size > STREAMING_TITLE_LIMIT:
+            raise Exception(f'No title found in the first {STREAMING_TITLE_LIMIT} characters')
+        head.append(block_to_html_node(block, context))
+    title = page_title(context)
+
+    def write_content(write):
+        write("<div>")
+        for node in head:
+            if on_node is not None:
+                on_node(node)
+            for chunk in html_chunks(node, context):
+                write(chunk)
+        head.clear()
+        for block in blocks:
+            node = block_to_html_node(block, context)
+            if on_node is not None:
+                on_node(node)
+            for chunk in html_chunks(node, context):
+                write(chunk)
+        write("</div>\n")
+
+    def write_page_to(out):
+        template_values = dict(values or {})
+        template_values.update({"Title": title, "Content": write_content, "Basepath": context.basepath})
+        template.render(template_values, out)
+
+    return write_page_to
+
+def page_observer(from_path, dest_path, meta):
+    # Link checks and the search index see every node of the page, whole or a block at a time
+    links = from_path is not None and collecting()
+    terms = from_path is not None and indexing()
+    if terms and meta.get('title'):
+        record_title(from_path, str(meta['title']))
+    if not (links or terms):
+        return None
+
+    def on_node(node):
+        if links:
+            record_links(from_path, dest_path, node)
+        if terms:
+            record_terms(from_path, node)
+    return on_node
+
+def page_writer(source, template, basepath, from_path=None, dest_path=None):
+    # Every render path puts a page together here: the context, front matter, title, link and
+    # search term recording and template values. source is the markdown text, or an iterator
+    # of lines to stream. Returns write_page_to(out); a missing title raises before anything
+    # is written
+    context = RenderContext(basepath, assets=active_assets(), images=active_images())
+    if isinstance(source, str):
+        meta, markdown = split_front_matter(source)
+    else:
+        meta, pending = read_front_matter(source)
+    # Set before parsing; the first h1 only fills in a missing title
+    apply_title(meta, context)
+    values = page_values(meta, from_path, context)
+    on_node = page_observer(from_path, dest_path, meta)
+    if not isinstance(source, str):
+        return stream_page(itertools.chain(pending, source), context, template, values, on_node)
+
+    with span('parse'):
+        node = parse_markdown(markdown, context)
+    page_title(context)
+    if on_node is not None:
+        on_node(node)
+    return lambda out: write_page(node, context, template, out, values)
+
+def render_page(markdown, template, basepath, from_path=None, dest_path=None):
+    # Renders to a string; template is a Template or its text
+    if isinstance(template, str):
+        template = Template(template)
+    chunks = []
+    page_writer(markdown, template, basepath, from_path, dest_path)(chunks)
+    return "".join(chunks)
+
+def render_markdown(markdown, template_path, basepath, from_path=None, dest_path=None):
+    # For callers that do their own file I/O; the paths are only used for links and collections
+    return render_page(markdown, asset_template(template_path), basepath, from_path, dest_path)
+
+# Markdown files above this size are converted block by block instead of being read whole
+STREAMING_THRESHOLD = 8 * 1024 * 1024
+
+def counted_lines(lines, page):
+    # Sizes a streamed page for --profile without holding on to any of it
+    page['chars_in'] = 0
+    for line in lines:
+        page['chars_in'] += len(line)
+        yield line
+
+class CountingWriter:
+    def __init__(self, out, page):
+        self.out = out
+        self.page = page
+        self.page['chars_out'] = 0
+
+    def write(self, text):
+        self.page['chars_out'] += len(text)
+        self.out.write(text)
+
+def render_page_file(from_path, template_path, dest_path, basepath):
+    template = asset_template(template_path)
+    # Content can only be streamed once, so templates that repeat it render in memory
+    if os.path.getsize(from_path) > STREAMING_THRESHOLD and template.slots().count("Content") == 1:
+        with span('page', source=from_path, streamed=True) as page:
+            with open(from_path, 'r', encoding='utf-8') as f:
+                lines = counted_lines(f, page) if tracing() else f
+                write_page_to = page_writer(lines, template, basepath, from_path, dest_path)
+                with open(dest_path, 'w', encoding='utf-8') as d:
+                    if tracing():
+                        d = CountingWriter(d, page)
+                    write_page_to(d)
+        return
+
+    with span('page', source=from_path) as page:
+        with span('read'):
+            with open(from_path, 'r', encoding='utf-8') as f:
+                markdown = f.read()
+        write_page_to = page_writer(markdown, template, basepath, from_path, dest_path)
+
+        if tracing():
+            # Buffer the page so serialization and the file write are timed separately
+            chunks = []
+            with span('render'):
+                write_page_to(chunks)
+            with span('write'):
+                with open(dest_path, 'w', encoding='utf-8') as d:
+                    d.writelines(chunks)
+            page['chars_in'] = len(markdown)
+            page['chars_out'] = sum(map(len, chunks))
+        else:
+            with open(dest_path, 'w', encoding='utf-8') as d:
+                write_page_to(d)
+
 def generate_page(from_path, template_path, dest_path, basepath):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
     try:
-        with open(from_path, 'r', encoding='utf-8') as f:
-            markdown = f.read()
-    except FileNotFoundError:
-        print(f"Error: The file '{from_path}' was not found.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
- 
-    try:
-        with open(template_path, 'r', encoding='utf-8') as t:
-            template = t.read()
-    except FileNotFoundError:
-        print(f"Error: The file '{template_path}' was not found.")
-    except Exception as e:
+        render_page_file(from_path, template_path, dest_path, basepath)
+    except FileNotFoundError as e:
+        print(f"Error: The file '{e.filename}' was not found.")
+    except OSError as e:
         print(f"An error occurred: {e}")
-    
-    html = markdown_to_html_node(markdown).to_html()
-    html = html.replace('href="/', f'href="{basepath}')
-    html = html.replace('src="/', f'src="{basepath}')
-    title = extract_title(html)
-    template = template.replace("{{ Title }}", title).replace("{{ Content }}", html)
 
-    try:
-        with open(dest_path, 'w', encoding='utf-8') as d:
-            d.write(template)
-    except FileNotFoundError:
-        print(f"Error: The file '{dest_path}' was not found.")
-    except Exception as e:
-        print(f"An error occurred: {e}")
+def page_destination(content_source, dir_path_content, dest_dir_path):
+    base, extension = os.path.splitext(os.path.relpath(content_source, dir_path_content))
+    return os.path.join(dest_dir_path, base + '.html')
+
+def find_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for root, dirs, files in os.walk(dir_path_content):
+        dirs.sort()
+        for content in sorted(files):
+            content_source = os.path.join(root, content)
+            pages.append((content_source, page_destination(content_source, dir_path_content, dest_dir_path)))
+    return pages
 
-def generate_pages_recursive(dir_path_content, template_path, dest_path_path, basepath):
+def generate_pages_recursive(dir_path_content, template_path, dest_path_path, basepath, layouts=None):
     try:
         # Check if the source directory exists
         if not os.path.exists(dir_path_content):
             print(f"Error: Source directory not found at '{dir_path_content}'")
             return
-        
-        if not os.path.exists(dest_path_path):
-            print(f'Creating directory: {dest_path_path}')
-            os.mkdir(dest_path_path)
-
-        directory_content = os.listdir(dir_path_content)
 
-        for content in directory_content:
-            content_source = os.path.join(dir_path_content, content)
-            if os.path.isfile(content_source):
-                base, extension = os.path.splitext(content)
-                destination = base + '.html'
-                content_destination = os.path.join(dest_path_path, destination)
-                generate_page(content_source, template_path, content_destination, basepath)
-            else:
-                content_destination = os.path.join(dest_path_path, content)
-                generate_pages_recursive(content_source, template_path, content_destination, basepath) 
+        for content_source, content_destination in find_pages(dir_path_content, dest_path_path):
+            destination_directory = os.path.dirname(content_destination)
+            if not os.path.exists(destination_directory):
+                print(f'Creating directory: {destination_directory}')
+                os.makedirs(destination_directory)
+            page_template = select_template(os.path.relpath(content_source, dir_path_content), template_path, layouts)
+            generate_page(content_source, page_template, content_destination, basepath)
     except OSError as e:
         print(f"Operating system error: {e}")
\ No newline at end of file
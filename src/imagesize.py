@@ -0,0 +1,104 @@
+import os
+import json
+import struct
+
+from atomic import write_atomic
+
+IMAGE_CACHE_PATH = '.cache/images.json'
+IMAGE_CACHE_VERSION = 1
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+# JPEG markers that carry the frame size; C4, C8 and CC share the range but are not frames
+JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers with no length field after them
+JPEG_STANDALONE_MARKERS = set(range(0xD0, 0xDA)) | {0x01}
+
+def jpeg_size(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if byte == b'':
+            return None
+        marker = byte[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack('>H', header)[0]
+        if marker in JPEG_FRAME_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>xHH', frame)
+            return (width, height)
+        # Skip the segment body without reading it
+        f.seek(length - 2, 1)
+        if f.read(1) != b'\xff':
+            return None
+
+def image_size(f):
+    # Reads only the header of an open binary file; returns (width, height) or None
+    head = f.read(30)
+    if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', head[6:10])
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP' and len(head) == 30:
+        chunk = head[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', head[26:30])
+            return (width & 0x3FFF, height & 0x3FFF)
+        if chunk == b'VP8L':
+            bits = struct.unpack('<I', head[21:25])[0]
+            return ((bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        if chunk == b'VP8X':
+            return (int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1)
+        return None
+    if head[:2] == b'\xff\xd8':
+        return jpeg_size(f)
+    return None
+
+def load_image_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if cache.get('version') != IMAGE_CACHE_VERSION:
+        return {}
+    return cache['images']
+
+def build_image_index(static_path, cache_path=IMAGE_CACHE_PATH):
+    # Site-absolute url -> [width, height]; files whose size and mtime match the cache are not opened
+    previous = {} if cache_path is None else load_image_cache(cache_path)
+    images = {}
+    read = 0
+    for root, dirs, files in os.walk(static_path):
+        for name in files:
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            url = '/' + os.path.relpath(path, static_path).replace(os.sep, '/')
+            image_stat = os.stat(path)
+            stamp = [image_stat.st_mtime_ns, image_stat.st_size]
+            cached = previous.get(url)
+            if cached is not None and cached['stamp'] == stamp:
+                images[url] = cached
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    size = image_size(f)
+            except (OSError, struct.error) as e:
+                print(f"Could not read the size of '{path}': {e}")
+                size = None
+            images[url] = {'stamp': stamp, 'size': None if size is None else list(size)}
+            read += 1
+
+    if cache_path is not None and (read or len(images) != len(previous)):
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        write_atomic(cache_path, json.dumps({'version': IMAGE_CACHE_VERSION, 'images': images}, separators=(',', ':'), sort_keys=True))
+    print(f"Indexed sizes of {len(images)} images ({read} read)")
+    return {url: image['size'] for url, image in images.items() if image['size'] is not None}
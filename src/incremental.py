@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+
+from htmlnode import find_pages, generate_page
+from parallel import render_pages_parallel
+from template import select_template
+from render import active_assets, active_images
+from atomic import write_atomic
+from frontmatter import active_metadata
+
+MANIFEST_NAME = '.manifest.json'
+MANIFEST_VERSION = 3
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(manifest_path, version=MANIFEST_VERSION):
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Ignoring unreadable manifest '{manifest_path}': {e}")
+        return None
+    if manifest.get('version') != version:
+        return None
+    return manifest
+
+def save_manifest(manifest_path, manifest):
+    # Write to a temporary file first so an interrupted build never leaves a truncated manifest
+    write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True))
+
+def remove_output(dest_path, dest_dir_path):
+    if os.path.exists(dest_path):
+        os.unlink(dest_path)
+        print(f"Removed file: {dest_path}")
+    # Prune directories that only held the removed page
+    directory = os.path.dirname(dest_path)
+    while os.path.abspath(directory) != os.path.abspath(dest_dir_path):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+
+def generate_pages_incremental(dir_path_content, template_path, dest_dir_path, basepath, jobs=1, layouts=None):
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return []
+    os.makedirs(dest_dir_path, exist_ok=True)
+
+    manifest_path = os.path.join(dest_dir_path, MANIFEST_NAME)
+    previous = load_manifest(manifest_path)
+    template_hashes = {}
+    for layout_template in [template_path] + [layout_path for pattern, layout_path in layouts or ()]:
+        if layout_template not in template_hashes:
+            template_hashes[layout_template] = hash_file(layout_template)
+
+    # Fingerprinted asset names end up in every page, so a changed map rebuilds them all
+    assets = active_assets()
+    assets_hash = None if assets is None else hashlib.sha256(json.dumps(assets, sort_keys=True).encode('utf-8')).hexdigest()
+    # So do image sizes, which end up in the img tags
+    images = active_images()
+    images_hash = None if images is None else hashlib.sha256(json.dumps(images, sort_keys=True).encode('utf-8')).hexdigest()
+    rebuild_all = (
+        previous is None or
+        previous['basepath'] != basepath or
+        previous.get('assets') != assets_hash or
+        previous.get('images') != images_hash
+    )
+    previous_pages = {} if previous is None else previous['pages']
+    previous_templates = {} if previous is None else previous['templates']
+    if rebuild_all:
+        print("Inputs changed, rebuilding all pages")
+
+    metadata = active_metadata()
+    pages = {}
+    stale = []
+    for content_source, content_destination in find_pages(dir_path_content, dest_dir_path):
+        key = os.path.relpath(content_source, dir_path_content)
+        source_hash = hash_file(content_source)
+        page_template = select_template(key, template_path, layouts)
+        entry = previous_pages.get(key)
+        # Collection pages list other pages, so they also go stale when those pages' metadata changes
+        listing = None
+        if metadata is not None:
+            page_metadata = metadata.entries.get(key.replace(os.sep, '/'))
+            if page_metadata is not None and page_metadata['collection']:
+                listing = metadata.collection_digest(page_metadata['collection'], key.replace(os.sep, '/'))
+        # A page is stale when its source, its layout or that layout's contents changed
+        if (
+            rebuild_all or
+            entry is None or
+            entry['hash'] != source_hash or
+            entry['template'] != page_template or
+            previous_templates.get(page_template) != template_hashes[page_template] or
+            entry.get('listing') != listing or
+            not os.path.exists(content_destination)
+        ):
+            stale.append((content_source, page_template, content_destination))
+        pages[key] = {
+            'hash': source_hash,
+            'template': page_template,
+            'dest': os.path.relpath(content_destination, dest_dir_path),
+            'listing': listing,
+        }
+
+    if jobs > 1:
+        errors = render_pages_parallel(stale, basepath, jobs)
+    else:
+        errors = []
+        for content_source, page_template, content_destination in stale:
+            os.makedirs(os.path.dirname(content_destination), exist_ok=True)
+            generate_page(content_source, page_template, content_destination, basepath)
+
+    current_outputs = {entry['dest'] for entry in pages.values()}
+    for key, entry in previous_pages.items():
+        if key not in pages and entry['dest'] not in current_outputs:
+            remove_output(os.path.join(dest_dir_path, entry['dest']), dest_dir_path)
+
+    # Leave failed pages out of the manifest so the next build retries them
+    for content_source, message in errors:
+        del pages[os.path.relpath(content_source, dir_path_content)]
+
+    save_manifest(manifest_path, {
+        'version': MANIFEST_VERSION,
+        'templates': template_hashes,
+        'basepath': basepath,
+        'assets': assets_hash,
+        'images': images_hash,
+        'pages': pages,
+    })
+    print(f"Rendered {len(stale) - len(errors)} of {len(pages) + len(errors)} pages")
+    return errors
@@ -0,0 +1,64 @@
+import re
+
+from textnode import TextType, TextNode
+
+# Every character sequence that can open an inline span; "**" must come before "*"
+INLINE_START = re.compile(r"\*\*|[*_`]|!?\[")
+
+DELIMITER_TYPES = {
+    "**": TextType.BOLD,
+    "*": TextType.ITALIC,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+def match_link(text, label_start):
+    # Mirrors the old "\[(.*?)\]\((.*?)\)" regexes: the label runs to the first "](",
+    # the url to the first ")" after it, and neither may cross a line break.
+    # A label never holds another "[", so "arr[0] ... [docs](/d)" links only "docs"
+    label_end = text.find("](", label_start)
+    if label_end == -1 or "\n" in text[label_start:label_end] or "[" in text[label_start:label_end]:
+        return None
+    url_end = text.find(")", label_end + 2)
+    if url_end == -1 or "\n" in text[label_end + 2:url_end]:
+        return None
+    return label_end, url_end
+
+def parse_inline(text):
+    nodes = []
+    plain_start = 0
+    position = 0
+    search = INLINE_START.search
+    while True:
+        match = search(text, position)
+        if match is None:
+            break
+        token = match.group()
+        start = match.start()
+        content_start = match.end()
+
+        if token[-1] == "[":
+            span = match_link(text, content_start)
+            if span is None:
+                position = content_start
+                continue
+            label_end, url_end = span
+            text_type = TextType.IMAGE if token == "![" else TextType.LINK
+            node = TextNode(text[content_start:label_end], text_type, url=text[label_end + 2:url_end])
+            end = url_end + 1
+        else:
+            # Everything up to the closing delimiter is taken literally, so nested markup stays text
+            content_end = text.find(token, content_start)
+            if content_end == -1:
+                raise ValueError("Invalid markdown syntax")
+            node = TextNode(text[content_start:content_end], DELIMITER_TYPES[token])
+            end = content_end + len(token)
+
+        if start > plain_start:
+            nodes.append(TextNode(text[plain_start:start], TextType.PLAIN))
+        nodes.append(node)
+        position = plain_start = end
+
+    if plain_start < len(text):
+        nodes.append(TextNode(text[plain_start:], TextType.PLAIN))
+    return nodes
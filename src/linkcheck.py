@@ -0,0 +1,168 @@
+import os
+import json
+import posixpath
+
+from atomic import write_atomic
+
+LINK_INDEX_NAME = '.links.json'
+LINK_INDEX_VERSION = 3
+
+# Tag -> (url prop, kind of reference) for the leaves links and images become
+REFERENCE_TAGS = {
+    'a': ('href', 'link'),
+    'img': ('src', 'image'),
+}
+
+class LinkCollector:
+    def __init__(self):
+        # Source path -> {'dest': output path, 'ids': [...], 'references': [[kind, url], ...]}
+        self.pages = {}
+
+    def record(self, source, dest, node):
+        # Only ids that end up in the output count as anchors; headings carry theirs as props
+        page = self.pages.setdefault(source, {'dest': dest, 'ids': [], 'references': []})
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            props = item._props
+            if props:
+                reference = REFERENCE_TAGS.get(item.tag)
+                for key, value in props:
+                    if key == 'id':
+                        page['ids'].append(value)
+                    elif reference is not None and key == reference[0]:
+                        page['references'].append([reference[1], value])
+            if item.children:
+                stack.extend(reversed(item.children))
+
+    def drain(self):
+        pages, self.pages = self.pages, {}
+        return pages
+
+_collector = None
+
+def start_collecting():
+    global _collector
+    _collector = LinkCollector()
+    return _collector
+
+def stop_collecting():
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+def collecting():
+    return _collector is not None
+
+def record_links(source, dest, node):
+    if _collector is not None:
+        _collector.record(source, dest, node)
+
+def drain_links():
+    return None if _collector is None else _collector.drain()
+
+def merge_links(pages):
+    # Pages collected by --jobs workers are handed back to the parent process
+    if _collector is not None:
+        _collector.pages.update(pages)
+
+def is_internal(url):
+    return not (url == '' or url.startswith('//') or ':' in url.split('/', 1)[0])
+
+def page_url(dest_path, dest_dir_path):
+    relative = os.path.relpath(dest_path, dest_dir_path).replace(os.sep, '/')
+    return '/' + relative
+
+def target_candidates(path):
+    # A directory url is served from its index.html; servers redirect "/blog" to "/blog/"
+    if path.endswith('/'):
+        return [path + 'index.html']
+    return [path, path + '/index.html']
+
+def source_lines(source, urls):
+    # Only pages with problems are read again, once each, to point at the offending lines
+    lines = {}
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                for url in urls:
+                    if url not in lines and f"]({url}" in line:
+                        lines[url] = number
+    except OSError:
+        pass
+    return lines
+
+def update_link_index(dest_dir_path, dir_path_content, pages):
+    # Incremental builds only render changed pages; the rest keep what the last build recorded
+    index_path = os.path.join(dest_dir_path, LINK_INDEX_NAME)
+    previous = {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('version') == LINK_INDEX_VERSION:
+            previous = stored['pages']
+    except (FileNotFoundError, ValueError):
+        pass
+    merged = {}
+    for source, page in previous.items():
+        if os.path.exists(os.path.join(dir_path_content, source)):
+            merged[source] = page
+    for source, page in pages.items():
+        merged[os.path.relpath(source, dir_path_content)] = {
+            'dest': os.path.relpath(page['dest'], dest_dir_path),
+            'ids': page['ids'],
+            'references': page['references'],
+        }
+    write_atomic(index_path, json.dumps({'version': LINK_INDEX_VERSION, 'pages': merged}, separators=(',', ':'), sort_keys=True))
+    return merged
+
+def check_links(dir_path_content, dest_dir_path, pages, assets=None):
+    # pages is the merged link index: relative source -> {'dest', 'ids', 'references'}
+    outputs = set()
+    for root, dirs, files in os.walk(dest_dir_path):
+        for name in files:
+            outputs.add(page_url(os.path.join(root, name), dest_dir_path))
+    ids = {'/' + page['dest'].replace(os.sep, '/'): set(page['ids']) for page in pages.values()}
+
+    problems = []
+    for source, page in sorted(pages.items()):
+        base = '/' + page['dest'].replace(os.sep, '/')
+        page_problems = []
+        for kind, url in page['references']:
+            if not is_internal(url):
+                continue
+            path, _, fragment = url.partition('#')
+            path = path.partition('?')[0]
+            if path == '':
+                path = base
+            elif not path.startswith('/'):
+                joined = posixpath.join(posixpath.dirname(base), path)
+                path = posixpath.normpath(joined)
+                # normpath drops the trailing slash that marks a directory
+                if joined.endswith('/') and path != '/':
+                    path += '/'
+            if assets:
+                path = assets.get(path, path)
+            target = next((candidate for candidate in target_candidates(path) if candidate in outputs), None)
+            if target is None:
+                problem = "missing image" if kind == 'image' else "dangling link"
+            elif fragment and target in ids and fragment not in ids[target]:
+                problem = "missing anchor"
+            else:
+                continue
+            page_problems.append((problem, url))
+        if page_problems:
+            source_path = os.path.join(dir_path_content, source)
+            lines = source_lines(source_path, {url for problem, url in page_problems})
+            for problem, url in page_problems:
+                location = f"{source_path}:{lines[url]}" if url in lines else source_path
+                problems.append((location, problem, url))
+    return problems
+
+def report_links(problems, checked):
+    if not problems:
+        print(f"Checked internal links in {checked} pages: no problems")
+        return
+    print(f"{len(problems)} broken internal reference(s) in {checked} pages:")
+    for location, problem, url in problems:
+        print(f"  {location}: {problem} {url}")
@@ -1,20 +1,180 @@
+import os
 import sys
+import argparse
 
 from textnode import TextNode, TextType
-from htmlnode import generate_pages_recursive, prepare_directory
+from htmlnode import generate_pages_recursive, prepare_directory, delete_directory
+from incremental import generate_pages_incremental
+from parallel import generate_pages_parallel, report_errors
+from template import parse_layout
+from sync import sync_directory, SYNC_MODES
+from buildtrace import start_tracing, stop_tracing, span, print_report, write_chrome_trace
+from parsecache import configure_parse_cache
+from compress import compress_outputs
+from minify import minify_outputs
+from pipeline import generate_pages_async, copy_directory_async
+from search import build_search_index
+from searchterms import start_indexing, stop_indexing
+from shard import parse_shard, render_shard
+from archive import write_archive, archive_format
+from linkcheck import start_collecting, stop_collecting, update_link_index, check_links, report_links
+from fingerprint import fingerprint_assets
+from render import configure_assets, active_assets, configure_images
+from imagesize import build_image_index
+from frontmatter import configure_metadata
+from metadata import build_metadata_index
 
 
 
 
 def main():
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Generate the static site from ./content into ./docs")
+    parser.add_argument('basepath', nargs='?', default='/')
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-render pages whose inputs changed since the last build")
+    parser.add_argument('-j', '--jobs', type=int,
+                        help="number of processes used to render pages (0 uses every CPU core); --gzip uses every core unless this is given")
+    parser.add_argument('--layout', action='append', default=[], type=parse_layout, metavar='PATTERN=TEMPLATE',
+                        help="render content files matching PATTERN (e.g. 'blog/**') with TEMPLATE instead of template.html")
+    parser.add_argument('--assets', choices=SYNC_MODES, default='copy',
+                        help="how incremental builds place changed static files in ./docs")
+    parser.add_argument('--profile', action='store_true',
+                        help="print per-phase timings and the slowest pages after the build")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="also write a Chrome trace-event JSON file (open in chrome://tracing or Perfetto)")
+    parser.add_argument('--parse-cache', nargs='?', const='.cache/parse', metavar='DIR',
+                        help="reuse parsed pages across builds from an on-disk cache (default DIR: .cache/parse)")
+    parser.add_argument('--parse-cache-size', type=int, default=512, metavar='MB',
+                        help="evict the least recently used parse cache entries beyond this size")
+    parser.add_argument('--io-workers', type=int, default=0, metavar='N',
+                        help="overlap file reads, rendering and writes with N I/O threads (for network storage)")
+    parser.add_argument('--shard', type=parse_shard, metavar='INDEX/COUNT',
+                        help="render only this shard of the pages (e.g. 2/8) for merging with src/shard.py")
+    parser.add_argument('--shard-dir', metavar='DIR',
+                        help="output directory for --shard (default: ./shards/INDEX-of-COUNT)")
+    parser.add_argument('--fingerprint', action='store_true',
+                        help="copy static files under content-hash names and rewrite references to them")
+    parser.add_argument('--search', action='store_true',
+                        help="write a sharded client-side search index to ./docs/search")
+    parser.add_argument('--check-links', nargs='?', const='warn', choices=('warn', 'error'),
+                        help="report internal links and images that point at nothing; 'error' also fails the build")
+    parser.add_argument('--minify', action='store_true',
+                        help="strip insignificant whitespace from generated html and css (cached in .cache/minify)")
+    parser.add_argument('--metadata', action='store_true',
+                        help="index front matter (cached in .cache/metadata.json) so 'collection:' pages can list other pages")
+    parser.add_argument('--image-sizes', action='store_true',
+                        help="add width, height and lazy loading attributes to images in ./static (sizes cached in .cache/images.json)")
+    parser.add_argument('--archive', metavar='FILE',
+                        help="write the site into one .tar, .tar.gz or .zip archive (plus FILE.index.json) instead of ./docs")
+    parser.add_argument('--gzip', action='store_true',
+                        help="write .gz sidecars next to compressible outputs for gzip_static style serving")
+    args = parser.parse_args()
+    if args.shard and (args.incremental or args.fingerprint or args.search or args.check_links):
+        parser.error("--shard renders a subset of pages and cannot be combined with --incremental, --fingerprint, --search or --check-links")
+    if args.shard and (args.minify or args.gzip):
+        parser.error("--minify and --gzip run on the merged site; pass them to src/shard.py instead of --shard")
+    if args.archive:
+        try:
+            archive_format(args.archive)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.shard or args.incremental or args.fingerprint or args.search or args.check_links or args.minify or args.gzip:
+            parser.error("--archive does not write ./docs and cannot be combined with --shard, --incremental, --fingerprint, --search, --check-links, --minify or --gzip")
+    if args.io_workers > 0 and (args.shard or args.archive or args.incremental):
+        parser.error("--io-workers only applies to full builds into ./docs and cannot be combined with --shard, --archive or --incremental")
+    if args.io_workers > 0 and args.jobs is not None:
+        parser.error("--io-workers renders pages on threads and cannot be combined with --jobs")
+    basepath = args.basepath
+    jobs = os.cpu_count() if args.jobs == 0 else args.jobs or 1
+
+    if args.profile or args.trace:
+        start_tracing()
+    cache = configure_parse_cache(args.parse_cache, args.parse_cache_size * 1024 * 1024)
+    if args.check_links:
+        start_collecting()
+    if args.search:
+        start_indexing()
+    if args.metadata:
+        with span('metadata'):
+            configure_metadata(build_metadata_index('./content'))
+    if args.image_sizes:
+        with span('images'):
+            configure_images(build_image_index('./static'))
+
+    output = './docs'
+    if args.archive:
+        with span('archive'):
+            errors = write_archive(args.archive, './static', './content', 'template.html', basepath, args.layout)
+    elif args.shard:
+        # Static files are copied once, by the merge
+        output = args.shard_dir or os.path.join('.', 'shards', f"{args.shard[0]}-of-{args.shard[1]}")
+        with span('pages'):
+            errors = render_shard('./content', 'template.html', output, basepath, args.shard, jobs, args.layout)
+    else:
+        with span('copy'):
+            copy_static(args)
+        with span('pages'):
+            errors = generate_pages(args, basepath, jobs)
+
+    broken = []
+    if args.check_links:
+        with span('links'):
+            pages = update_link_index(output, './content', stop_collecting().drain())
+            broken = check_links('./content', output, pages, active_assets())
+        report_links(broken, len(pages))
+
+    if args.search:
+        with span('search'):
+            build_search_index('./content', output, basepath, stop_indexing().drain())
+
+    if args.minify:
+        with span('minify'):
+            minify_outputs(output)
+
+    if args.gzip:
+        with span('compress'):
+            # Compression runs on threads, so it uses every core unless -j says otherwise
+            compress_outputs(output, os.cpu_count() if args.jobs is None else jobs)
+
+    if cache is not None:
+        evicted = cache.evict()
+        print(f"Parse cache: {cache.hits} hits, {cache.misses} misses, {evicted} evicted")
+
+    tracer = stop_tracing()
+    if tracer is not None:
+        print_report(tracer)
+        if args.trace:
+            write_chrome_trace(tracer, args.trace)
+            print(f"Wrote trace events to {args.trace}")
+
+    if errors:
+        report_errors(errors)
+    if errors or (broken and args.check_links == 'error'):
+        sys.exit(1)
+
+def copy_static(args):
+    if args.fingerprint:
+        if not args.incremental:
+            delete_directory('./docs')
+        configure_assets(fingerprint_assets('./static', './docs'))
+    elif args.incremental:
+        sync_directory('./static', './docs', args.assets)
+    elif args.io_workers > 0:
+        delete_directory('./docs')
+        copy_directory_async('./static', './docs', args.io_workers)
     else:
-        basepath = '/'
-    
-    prepare_directory('./static','./docs')
-    generate_pages_recursive('./content', 'template.html', './docs', basepath)
+        prepare_directory('./static','./docs')
+
+def generate_pages(args, basepath, jobs):
+    if args.incremental:
+        return generate_pages_incremental('./content', 'template.html', './docs', basepath, jobs, args.layout)
+    if args.io_workers > 0:
+        return generate_pages_async('./content', 'template.html', './docs', basepath, args.io_workers, args.layout)
+    if jobs > 1:
+        return generate_pages_parallel('./content', 'template.html', './docs', basepath, jobs, args.layout)
+    generate_pages_recursive('./content', 'template.html', './docs', basepath, args.layout)
+    return []
 
             
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
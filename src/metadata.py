@@ -0,0 +1,78 @@
+import os
+import json
+import itertools
+
+from htmlnode import find_pages, page_destination
+from frontmatter import read_front_matter, collection_prefix, MetadataIndex
+from atomic import write_atomic
+
+METADATA_CACHE_PATH = '.cache/metadata.json'
+METADATA_VERSION = 1
+
+def page_url(content_source, dir_path_content):
+    relative = page_destination(content_source, dir_path_content, '').replace(os.sep, '/')
+    if relative == 'index.html' or relative.endswith('/index.html'):
+        relative = relative[:-len('index.html')]
+    return '/' + relative
+
+def scan_title(lines):
+    # The first "# " heading outside code blocks, read without parsing the page
+    fenced = False
+    for line in lines:
+        if line.startswith('```'):
+            fenced = not fenced
+        elif not fenced and line.startswith('# '):
+            return line[2:].strip()
+    return None
+
+def page_metadata(content_source, dir_path_content):
+    with open(content_source, 'r', encoding='utf-8') as f:
+        meta, pending = read_front_matter(f)
+        title = meta.get('title') or scan_title(itertools.chain(pending, f))
+    tags = meta.get('tags', [])
+    return {
+        'title': None if title is None else str(title),
+        'date': str(meta.get('date', '')),
+        'tags': tags if isinstance(tags, list) else [str(tags)],
+        'url': page_url(content_source, dir_path_content),
+        'collection': collection_prefix(meta),
+    }
+
+def load_metadata_cache(cache_path, dir_path_content):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if cache.get('version') != METADATA_VERSION or cache.get('content') != dir_path_content:
+        return {}
+    return cache['pages']
+
+def build_metadata_index(dir_path_content, cache_path=METADATA_CACHE_PATH):
+    # Pages whose size and mtime match the cache are not opened at all
+    previous = {} if cache_path is None else load_metadata_cache(cache_path, dir_path_content)
+    pages = {}
+    read = 0
+    for content_source, content_destination in find_pages(dir_path_content, ''):
+        key = os.path.relpath(content_source, dir_path_content).replace(os.sep, '/')
+        source_stat = os.stat(content_source)
+        stamp = [source_stat.st_mtime_ns, source_stat.st_size]
+        cached = previous.get(key)
+        if cached is not None and cached['stamp'] == stamp:
+            pages[key] = cached
+            continue
+        try:
+            entry = page_metadata(content_source, dir_path_content)
+        except (UnicodeDecodeError, ValueError) as e:
+            # The page fails again when it is rendered; that error is the one reported
+            print(f"Skipping metadata for '{content_source}': {e}")
+            continue
+        pages[key] = {'stamp': stamp, 'entry': entry}
+        read += 1
+
+    if cache_path is not None and (read or len(pages) != len(previous)):
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        write_atomic(cache_path, json.dumps({'version': METADATA_VERSION, 'content': dir_path_content, 'pages': pages},
+                                            separators=(',', ':'), sort_keys=True))
+    print(f"Indexed metadata for {len(pages)} pages ({read} read)")
+    return MetadataIndex(dir_path_content, {key: page['entry'] for key, page in pages.items()})
@@ -0,0 +1,124 @@
+import os
+import re
+import hashlib
+
+from parsecache import ParseCache
+from atomic import write_atomic
+
+# Bump whenever minify_html or minify_css produce different output for the same input
+MINIFY_VERSION = 2
+MINIFY_CACHE_DIRECTORY = os.path.join('.cache', 'minify')
+MINIFY_CACHE_BYTES = 64 * 1024 * 1024
+
+# Whitespace inside these elements is content and is copied through untouched
+PRESERVED_PATTERN = re.compile(r"(<(pre|code|textarea|script|style)\b.*?</\2\s*>)", re.DOTALL | re.IGNORECASE)
+TAG_GAP_PATTERN = re.compile(r"<[!/]?([a-zA-Z][\w-]*)[^>]*>(\s+)(?=<[!/]?([a-zA-Z][\w-]*))")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Whitespace next to these never renders, so it can be dropped instead of collapsed
+BLOCK_TAGS = frozenset((
+    'doctype', 'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style',
+    'article', 'section', 'nav', 'header', 'footer', 'main', 'aside', 'div',
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'blockquote', 'pre',
+    'table', 'thead', 'tbody', 'tr', 'td', 'th', 'hr', 'br',
+))
+
+# A string (group 1) or a comment, whichever starts first
+CSS_TOKEN_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.DOTALL)
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*")
+CSS_COLON_PATTERN = re.compile(r":\s+")
+
+def minify_text(text):
+    def close_gap(match):
+        tag = match.group()[:-len(match.group(2))]
+        if match.group(1).lower() in BLOCK_TAGS or match.group(3).lower() in BLOCK_TAGS:
+            return tag
+        return tag + ' '
+
+    return WHITESPACE_PATTERN.sub(' ', TAG_GAP_PATTERN.sub(close_gap, text))
+
+def minify_html(html):
+    # The split yields text, then a preserved element and its tag name, repeating
+    parts = PRESERVED_PATTERN.split(html)
+    chunks = []
+    for index in range(0, len(parts), 3):
+        # Bare copies of the neighbouring preserved tags let the gaps next to them close too
+        prefix = f"</{parts[index - 1]}>" if index > 0 else ""
+        suffix = f"<{parts[index + 2]}>" if index + 2 < len(parts) else ""
+        text = minify_text(prefix + parts[index] + suffix)
+        chunks.append(text[len(prefix):len(text) - len(suffix)])
+        if index + 1 < len(parts):
+            chunks.append(parts[index + 1])
+    return "".join(chunks).strip()
+
+def minify_css_text(text):
+    text = WHITESPACE_PATTERN.sub(' ', text)
+    text = CSS_PUNCTUATION_PATTERN.sub(r"\1", text)
+    # Only after the colon: "a :hover" and "a:hover" select different elements
+    return CSS_COLON_PATTERN.sub(':', text).replace(';}', '}')
+
+def minify_css(css):
+    # Strings and comments are matched together, so a quote inside a comment opens no
+    # string and "/*" inside a string starts no comment. Strings keep their contents
+    chunks = []
+    text = []
+    position = 0
+    for match in CSS_TOKEN_PATTERN.finditer(css):
+        text.append(css[position:match.start()])
+        if match.group(1) is not None:
+            chunks.append(minify_css_text("".join(text)))
+            chunks.append(match.group(1))
+            text = []
+        position = match.end()
+    text.append(css[position:])
+    chunks.append(minify_css_text("".join(text)))
+    return "".join(chunks).strip()
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.css': minify_css,
+}
+
+def minify_key(extension, data):
+    digest = hashlib.sha256(f"{MINIFY_VERSION}:{extension}:".encode('utf-8'))
+    digest.update(data)
+    return digest.hexdigest()
+
+def minify_file(path, cache=None):
+    extension = os.path.splitext(path)[1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = minify_key(extension, data)
+    minified = None if cache is None else cache.get(key)
+    if minified is None:
+        minified = MINIFIERS[extension](data.decode('utf-8')).encode('utf-8')
+        if cache is not None:
+            cache.put(key, minified)
+            # Incremental builds leave unchanged outputs minified; remember that they are done
+            cache.put(minify_key(extension, minified), minified)
+    if minified == data:
+        return len(data), len(data)
+
+    write_atomic(path, minified)
+    return len(data), len(minified)
+
+def minify_outputs(directory, cache_directory=MINIFY_CACHE_DIRECTORY):
+    cache = None if cache_directory is None else ParseCache(cache_directory, MINIFY_CACHE_BYTES)
+    files = 0
+    bytes_in = 0
+    bytes_out = 0
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+        for name in sorted(names):
+            if name.startswith('.') or os.path.splitext(name)[1] not in MINIFIERS:
+                continue
+            size_in, size_out = minify_file(os.path.join(root, name), cache)
+            files += 1
+            bytes_in += size_in
+            bytes_out += size_out
+    if cache is not None:
+        cache.evict()
+    saved = bytes_in - bytes_out
+    percent = saved / bytes_in * 100 if bytes_in else 0.0
+    print(f"Minified {files} files in {directory}: {bytes_in} -> {bytes_out} bytes, {saved} saved ({percent:.1f}%)")
+    return bytes_in, bytes_out
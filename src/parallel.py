@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from htmlnode import find_pages, render_page_file
+from template import select_template
+from buildtrace import start_tracing, stop_tracing, tracing, record_events
+from parsecache import configure_parse_cache, active_parse_cache
+from render import configure_assets, active_assets, configure_images, active_images
+from linkcheck import start_collecting, stop_collecting, collecting, drain_links, merge_links
+from frontmatter import configure_metadata, active_metadata
+from searchterms import start_indexing, stop_indexing, indexing, drain_terms, merge_terms
+
+def _init_worker(cache_directory, cache_max_bytes, assets, images, metadata, collect_links, collect_terms):
+    configure_parse_cache(cache_directory, cache_max_bytes)
+    configure_assets(assets)
+    configure_images(images)
+    configure_metadata(metadata)
+    if collect_links:
+        start_collecting()
+    else:
+        stop_collecting()
+    if collect_terms:
+        start_indexing()
+    else:
+        stop_indexing()
+
+def _render_job(job):
+    from_path, template_path, dest_path, basepath, trace = job
+    if trace:
+        start_tracing()
+    cache = active_parse_cache()
+    counts = (0, 0) if cache is None else (cache.hits, cache.misses)
+    try:
+        # load_template caches per process, so each worker compiles every layout once
+        render_page_file(from_path, template_path, dest_path, basepath)
+        error = None
+    except Exception as e:
+        error = (from_path, f"{type(e).__name__}: {e}")
+    events = stop_tracing().events if trace else None
+    # Workers count cache use on their own copy; the parent adds the differences up
+    lookups = None if cache is None else (cache.hits - counts[0], cache.misses - counts[1])
+    return error, events, lookups, drain_links(), drain_terms()
+
+def render_pages_parallel(pages, basepath, jobs):
+    # pages holds (source, template, destination) triples
+    for directory in sorted({os.path.dirname(dest) for _, _, dest in pages}):
+        os.makedirs(directory, exist_ok=True)
+
+    trace = tracing()
+    job_list = [(source, template, dest, basepath, trace) for source, template, dest in pages]
+    # Hand out several chunks per worker so one slow page does not stall a whole share
+    chunksize = max(1, len(job_list) // (jobs * 4))
+    errors = []
+    cache = active_parse_cache()
+    # Workers may be spawned rather than forked, so they are told about the cache, assets, images and metadata explicitly
+    initargs = (None, 0) if cache is None else (cache.directory, cache.max_bytes)
+    initargs += (active_assets(), active_images(), active_metadata(), collecting(), indexing())
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+        for error, events, lookups, links, terms in executor.map(_render_job, job_list, chunksize=chunksize):
+            if error is not None:
+                errors.append(error)
+            if events:
+                record_events(events)
+            if lookups is not None:
+                cache.hits += lookups[0]
+                cache.misses += lookups[1]
+            if links:
+                merge_links(links)
+            if terms:
+                merge_terms(terms)
+    return errors
+
+def generate_pages_parallel(dir_path_content, template_path, dest_dir_path, basepath, jobs, layouts=None):
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return []
+    pages = [
+        (source, select_template(os.path.relpath(source, dir_path_content), template_path, layouts), dest)
+        for source, dest in find_pages(dir_path_content, dest_dir_path)
+    ]
+    errors = render_pages_parallel(pages, basepath, jobs)
+    print(f"Rendered {len(pages) - len(errors)} of {len(pages)} pages using {jobs} jobs")
+    return errors
+
+def report_errors(errors):
+    if errors == []:
+        return
+    print(f"{len(errors)} page(s) failed to render:")
+    for from_path, message in errors:
+        print(f"  {from_path}: {message}")
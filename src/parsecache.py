@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import hashlib
+
+from atomic import write_atomic, TEMPORARY_PREFIX
+
+# Bump whenever markdown_to_html_node produces a different tree for the same source
+PARSE_CACHE_VERSION = 3
+
+# Temporary files older than this were left behind by a build that died mid-write
+STALE_TEMPORARY_SECONDS = 3600
+
+class ParseCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown):
+        # Trees are stored with marshal, whose format is tied to the Python version
+        digest = hashlib.sha256(f"{PARSE_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode('utf-8'))
+        digest.update(markdown.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.bin')
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # The mtime doubles as the last-use time for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Concurrent builds may write the same entry
+        write_atomic(path, data)
+
+    def evict(self):
+        entries = []
+        total = 0
+        now = time.time()
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if name.startswith(TEMPORARY_PREFIX):
+                    if now - stat.st_mtime > STALE_TEMPORARY_SECONDS:
+                        self.remove(path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        # Evict down to 90% of the limit so the next few builds do not all have to evict again
+        entries.sort()
+        removed = 0
+        for mtime, size, path in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            self.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def remove(self, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            # Another build evicted it first
+            pass
+
+_cache = None
+
+def configure_parse_cache(directory, max_bytes):
+    global _cache
+    _cache = None if directory is None else ParseCache(directory, max_bytes)
+    return _cache
+
+def active_parse_cache():
+    return _cache
@@ -0,0 +1,128 @@
+import os
+import shutil
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from htmlnode import find_pages, render_markdown, render_page_file, STREAMING_THRESHOLD
+from template import select_template
+from sync import find_assets
+from buildtrace import span
+
+# Pages read ahead of the renderer, and rendered pages waiting for their write, per I/O worker
+QUEUE_DEPTH_PER_WORKER = 2
+
+def read_source(path):
+    # Large sources are left for render_page_file to stream instead of being held in a queue
+    if os.path.getsize(path) > STREAMING_THRESHOLD:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def write_output(path, html):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+def stream_output(source, template, dest, basepath):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    render_page_file(source, template, dest, basepath)
+
+async def read_pages(loop, io, pages, rendering, failures):
+    for source, template, dest in pages:
+        try:
+            markdown = await loop.run_in_executor(io, read_source, source)
+        except Exception as e:
+            failures.append((source, f"{type(e).__name__}: {e}"))
+            continue
+        await rendering.put((source, template, dest, markdown))
+
+async def render_pages(loop, cpu, basepath, rendering, writing, failures):
+    while True:
+        job = await rendering.get()
+        if job is None:
+            return
+        source, template, dest, markdown = job
+        try:
+            if markdown is None:
+                # Streams straight to the output file, so there is nothing left to write
+                await loop.run_in_executor(cpu, stream_output, source, template, dest, basepath)
+                continue
+            with span('render', source=source):
+                html = await loop.run_in_executor(cpu, render_markdown, markdown, template, basepath, source, dest)
+        except Exception as e:
+            failures.append((source, f"{type(e).__name__}: {e}"))
+            continue
+        await writing.put((source, dest, html))
+
+async def write_pages(loop, io, writing, failures):
+    while True:
+        job = await writing.get()
+        if job is None:
+            return
+        source, dest, html = job
+        try:
+            await loop.run_in_executor(io, write_output, dest, html)
+        except Exception as e:
+            failures.append((source, f"{type(e).__name__}: {e}"))
+
+async def run_pipeline(pages, basepath, io_workers):
+    loop = asyncio.get_running_loop()
+    # Bounded queues keep at most a few pages per worker in memory between stages
+    depth = io_workers * QUEUE_DEPTH_PER_WORKER
+    rendering = asyncio.Queue(depth)
+    writing = asyncio.Queue(depth)
+    failures = []
+    # A single render thread: page rendering holds the GIL, so more threads would only contend
+    with ThreadPoolExecutor(io_workers) as io, ThreadPoolExecutor(1) as cpu:
+        # Each reader has at most one read in flight, which bounds outstanding reads by io_workers
+        shares = [pages[index::io_workers] for index in range(io_workers)]
+        readers = [asyncio.ensure_future(read_pages(loop, io, share, rendering, failures)) for share in shares]
+        renderer = asyncio.ensure_future(render_pages(loop, cpu, basepath, rendering, writing, failures))
+        writers = [asyncio.ensure_future(write_pages(loop, io, writing, failures)) for _ in range(io_workers)]
+        await asyncio.gather(*readers)
+        await rendering.put(None)
+        await renderer
+        for _ in writers:
+            await writing.put(None)
+        await asyncio.gather(*writers)
+    return failures
+
+def render_pages_async(pages, basepath, io_workers):
+    # pages holds (source, template, destination) triples, like render_pages_parallel
+    return asyncio.run(run_pipeline(pages, basepath, io_workers))
+
+def generate_pages_async(dir_path_content, template_path, dest_dir_path, basepath, io_workers, layouts=None):
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return []
+    pages = [
+        (source, select_template(os.path.relpath(source, dir_path_content), template_path, layouts), dest)
+        for source, dest in find_pages(dir_path_content, dest_dir_path)
+    ]
+    errors = render_pages_async(pages, basepath, io_workers)
+    print(f"Rendered {len(pages) - len(errors)} of {len(pages)} pages with {io_workers} I/O workers")
+    return errors
+
+def copy_file(source_path, dest_path):
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    shutil.copy2(source_path, dest_path)
+
+async def run_copies(source, destination, io_workers):
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(io_workers * QUEUE_DEPTH_PER_WORKER)
+
+    async def copy(relative):
+        async with limit:
+            await loop.run_in_executor(io, copy_file, os.path.join(source, relative), os.path.join(destination, relative))
+
+    with ThreadPoolExecutor(io_workers) as io:
+        assets = find_assets(source)
+        await asyncio.gather(*[copy(relative) for relative in assets])
+    return len(assets)
+
+def copy_directory_async(source, destination, io_workers):
+    if not os.path.exists(source):
+        print(f"Error: Source directory not found at '{source}'")
+        return
+    copied = asyncio.run(run_copies(source, destination, io_workers))
+    print(f"Copied {copied} files from {source} to {destination} with {io_workers} I/O workers")
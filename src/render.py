@@ -0,0 +1,107 @@
+import re
+
+from template import Template, load_template
+
+# Props whose values are urls and go through the context's resolver
+URL_PROPS = ('href', 'src')
+
+REFERENCE_PATTERN = re.compile(r"""\b(href|src)=(['"])([^'"]*)\2""")
+SLUG_DROP_PATTERN = re.compile(r"[^\w\- ]")
+
+def heading_slug(text):
+    # The GitHub style anchor for a heading: lowercase words joined by hyphens
+    return SLUG_DROP_PATTERN.sub('', text.strip().lower()).replace(' ', '-')
+
+def basepath_resolver(basepath, assets=None):
+    # assets maps site-absolute asset urls to their fingerprinted names
+    def resolve(url):
+        # Only site-absolute urls are rebased; protocol-relative "//host" urls are left alone
+        if url.startswith('/') and not url.startswith('//'):
+            if assets:
+                url = assets.get(url, url)
+            return basepath + url[1:]
+        return url
+    return resolve
+
+class RenderContext:
+    def __init__(self, basepath='/', url_resolver=None, assets=None, images=None):
+        self.basepath = basepath
+        self.resolve_url = url_resolver if url_resolver is not None else basepath_resolver(basepath, assets)
+        # Site-absolute image url -> [width, height]; None leaves img tags as they are
+        self.images = images
+        # Filled in from the first h1 while the node tree is built
+        self.title = None
+        # Heading slug -> times seen on this page; streamed pages keep counting across blocks
+        self.heading_ids = {}
+
+    def heading_id(self, text):
+        # Repeated headings get "-1", "-2" like GitHub; None when nothing is left of the text
+        slug = heading_slug(text)
+        if not slug:
+            return None
+        seen = self.heading_ids.get(slug, 0)
+        self.heading_ids[slug] = seen + 1
+        return slug if seen == 0 else f"{slug}-{seen}"
+
+    def image_attributes(self, src):
+        # Known sizes let the browser reserve the space before the image arrives
+        size = self.images.get(split_url(src)[0])
+        attributes = '' if size is None else f' width="{size[0]}" height="{size[1]}"'
+        return attributes + ' loading="lazy" decoding="async"'
+
+def split_url(url):
+    # Keeps "?query" and "#fragment" out of the lookup and puts them back afterwards
+    position = len(url)
+    for marker in '?#':
+        index = url.find(marker)
+        if index != -1:
+            position = min(position, index)
+    return url[:position], url[position:]
+
+def rewrite_references(text, assets):
+    # Only exact site-absolute asset urls are replaced; basepath handling stays with the caller
+    def replace(match):
+        attribute, quote, url = match.groups()
+        path, suffix = split_url(url)
+        if path not in assets:
+            return match.group()
+        return f"{attribute}={quote}{assets[path]}{suffix}{quote}"
+
+    return REFERENCE_PATTERN.sub(replace, text)
+
+# Asset url map used while rendering, set once per process like the parse cache
+_assets = None
+
+def configure_assets(assets):
+    global _assets
+    _assets = assets
+    _asset_templates.clear()
+    return _assets
+
+def active_assets():
+    return _assets
+
+# Image size index used while rendering, set once per process like the asset map
+_images = None
+
+def configure_images(images):
+    global _images
+    _images = images
+    return _images
+
+def active_images():
+    return _images
+
+# Rewritten templates keyed by path, each stored with the compiled template it came from
+_asset_templates = {}
+
+def asset_template(template_path):
+    template = load_template(template_path)
+    if not _assets:
+        return template
+    cached = _asset_templates.get(template_path)
+    if cached is not None and cached[0] is template:
+        return cached[1]
+    rewritten = Template(rewrite_references(template.text, _assets))
+    _asset_templates[template_path] = (template, rewritten)
+    return rewritten
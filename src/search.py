@@ -0,0 +1,137 @@
+import os
+import re
+import json
+
+from htmlnode import find_pages, parse_markdown
+from incremental import hash_file, load_manifest, save_manifest, remove_output
+from render import RenderContext
+from frontmatter import split_front_matter
+from atomic import write_atomic
+from searchterms import page_terms
+
+SEARCH_DIRECTORY = 'search'
+SEARCH_STATE_NAME = '.state.json'
+SEARCH_VERSION = 1
+# Terms are sharded by this many leading characters; a search loads one shard per query term
+SHARD_PREFIX_LENGTH = 2
+# Terms starting with anything but a-z or 0-9 share one shard
+OTHER_SHARD = '_'
+
+SHARD_NAME_PATTERN = re.compile(r"[a-z0-9]+")
+
+def shard_name(term):
+    prefix = term[:SHARD_PREFIX_LENGTH]
+    if SHARD_NAME_PATTERN.fullmatch(prefix):
+        return prefix
+    return OTHER_SHARD
+
+def page_url(dest, dest_dir_path, basepath):
+    relative = os.path.relpath(dest, dest_dir_path).replace(os.sep, '/')
+    if relative == 'index.html':
+        return basepath
+    if relative.endswith('/index.html'):
+        relative = relative[:-len('index.html')]
+    return basepath + relative
+
+def encode_postings(postings):
+    # [page id, [first position, gap, gap, ...], page id, [...], ...]
+    encoded = []
+    for page_id in sorted(postings):
+        positions = postings[page_id]
+        encoded.append(page_id)
+        encoded.append([positions[0]] + [positions[index] - positions[index - 1] for index in range(1, len(positions))])
+    return encoded
+
+def write_if_changed(path, text):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, text)
+    return True
+
+def build_search_index(dir_path_content, dest_dir_path, basepath, collected=None):
+    # collected holds the terms recorded while the pages were rendered, keyed by source path;
+    # only pages the build did not render and the stored index cannot vouch for are parsed here
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return
+    index_path = os.path.join(dest_dir_path, SEARCH_DIRECTORY)
+    os.makedirs(index_path, exist_ok=True)
+    state_path = os.path.join(index_path, SEARCH_STATE_NAME)
+    previous = load_manifest(state_path, SEARCH_VERSION)
+    if previous is not None and previous['basepath'] != basepath:
+        previous = None
+    previous_pages = {} if previous is None else previous['pages']
+
+    # Page ids stay with their source across builds so unchanged shards keep their bytes
+    pages = {}
+    next_id = max([entry['id'] for entry in previous_pages.values()], default=-1) + 1
+    rendered = {} if collected is None else {
+        os.path.relpath(source, dir_path_content): page for source, page in collected.items()
+    }
+    tokenized = 0
+    for content_source, content_destination in find_pages(dir_path_content, dest_dir_path):
+        key = os.path.relpath(content_source, dir_path_content)
+        source_hash = hash_file(content_source)
+        entry = previous_pages.get(key)
+        page = rendered.get(key)
+        if page is not None:
+            title, terms = page['title'], page['terms']
+        elif entry is not None and entry['hash'] == source_hash:
+            pages[key] = entry
+            continue
+        else:
+            with open(content_source, 'r', encoding='utf-8') as f:
+                meta, markdown = split_front_matter(f.read())
+            node = parse_markdown(markdown, RenderContext(basepath))
+            title, terms = page_terms(node)
+            if meta.get('title'):
+                title = str(meta['title'])
+            tokenized += 1
+        if entry is None:
+            page_id = next_id
+            next_id += 1
+        else:
+            page_id = entry['id']
+        pages[key] = {
+            'id': page_id,
+            'hash': source_hash,
+            'url': page_url(content_destination, dest_dir_path, basepath),
+            'title': title,
+            'terms': terms,
+        }
+
+    shards = {}
+    for entry in pages.values():
+        for term, positions in entry['terms'].items():
+            shards.setdefault(shard_name(term), {}).setdefault(term, {})[entry['id']] = positions
+
+    # Ids of removed pages are left empty rather than reused, so their slots read as null
+    documents = [None] * next_id
+    for entry in pages.values():
+        documents[entry['id']] = {'url': entry['url'], 'title': entry['title']}
+    meta = {
+        'version': SEARCH_VERSION,
+        'prefix_length': SHARD_PREFIX_LENGTH,
+        'shards': sorted(shards),
+        'pages': documents,
+    }
+    written = int(write_if_changed(os.path.join(index_path, 'meta.json'), json.dumps(meta, separators=(',', ':'))))
+    for name, terms in shards.items():
+        shard = {term: encode_postings(postings) for term, postings in sorted(terms.items())}
+        written += write_if_changed(os.path.join(index_path, name + '.json'), json.dumps(shard, separators=(',', ':')))
+
+    previous_shards = set() if previous is None else set(previous['shards'])
+    for name in previous_shards - shards.keys():
+        remove_output(os.path.join(index_path, name + '.json'), dest_dir_path)
+
+    save_manifest(state_path, {
+        'version': SEARCH_VERSION,
+        'basepath': basepath,
+        'shards': sorted(shards),
+        'pages': pages,
+    })
+    print(f"Indexed {len(pages)} pages into {len(shards)} search shards: {len(rendered)} from the build, {tokenized} parsed, {written} files written")
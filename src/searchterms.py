@@ -0,0 +1,79 @@
+import re
+
+TERM_PATTERN = re.compile(r"\w+")
+
+def tokenize(text):
+    return [term.lower() for term in TERM_PATTERN.findall(text)]
+
+def collect_terms(node, terms, position=0):
+    # Leaves are tokenized one by one so words in neighbouring blocks never run together.
+    # Returns the first h1's text, if any, and the next free position
+    title = None
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if item.children is None:
+            for term in tokenize(item.value):
+                terms.setdefault(term, []).append(position)
+                position += 1
+            continue
+        if item.tag == 'h1' and title is None:
+            title = "".join(leaf.value for leaf in item.children if leaf.children is None)
+        stack.extend(reversed(item.children))
+    return title, position
+
+def page_terms(node):
+    terms = {}
+    title, position = collect_terms(node, terms)
+    return title, terms
+
+class TermCollector:
+    def __init__(self):
+        # Source path -> {'title': ..., 'terms': {term: [positions]}, 'length': next position}
+        self.pages = {}
+
+    def page(self, source):
+        return self.pages.setdefault(source, {'title': None, 'terms': {}, 'length': 0})
+
+    def record(self, source, node):
+        # Streamed pages arrive a block at a time, so positions carry on from the last block
+        page = self.page(source)
+        title, page['length'] = collect_terms(node, page['terms'], page['length'])
+        if page['title'] is None:
+            page['title'] = title
+
+    def drain(self):
+        pages, self.pages = self.pages, {}
+        return pages
+
+_collector = None
+
+def start_indexing():
+    global _collector
+    _collector = TermCollector()
+    return _collector
+
+def stop_indexing():
+    global _collector
+    collector, _collector = _collector, None
+    return collector
+
+def indexing():
+    return _collector is not None
+
+def record_terms(source, node):
+    if _collector is not None:
+        _collector.record(source, node)
+
+def record_title(source, title):
+    # A front matter title wins over the first h1
+    if _collector is not None:
+        _collector.page(source)['title'] = title
+
+def drain_terms():
+    return None if _collector is None else _collector.drain()
+
+def merge_terms(pages):
+    # Pages tokenized by --jobs workers are handed back to the parent process
+    if _collector is not None:
+        _collector.pages.update(pages)
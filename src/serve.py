@@ -0,0 +1,168 @@
+import os
+import hashlib
+import argparse
+import threading
+import posixpath
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+
+from htmlnode import render_markdown
+from template import parse_layout, select_template
+
+class PageCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        # Source path -> (validator, body, etag), least recently used first
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, source, validator):
+        with self.lock:
+            entry = self.entries.get(source)
+            if entry is None:
+                return None
+            if entry[0] != validator:
+                # The source or its template changed since the page was rendered
+                self.discard(source)
+                return None
+            self.entries.move_to_end(source)
+            return entry
+
+    def put(self, source, validator, body, etag):
+        with self.lock:
+            if source in self.entries:
+                self.discard(source)
+            # Pages larger than the whole cache are served but never kept
+            if len(body) > self.max_bytes:
+                return
+            self.entries[source] = (validator, body, etag)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self.discard(oldest)
+
+    def discard(self, source):
+        validator, body, etag = self.entries.pop(source)
+        self.size -= len(body)
+
+def page_source(dir_path_content, url_path):
+    # Inverse of page_destination: /blog/tom/ and /blog/tom/index.html come from blog/tom/index.md
+    if not url_path.startswith('/'):
+        return None
+    path = posixpath.normpath(unquote(url_path))
+    if url_path.endswith('/'):
+        path = posixpath.join(path, 'index.html')
+    if not path.endswith('.html'):
+        return None
+    relative = path.lstrip('/')[:-len('.html')] + '.md'
+    source = os.path.join(dir_path_content, *relative.split('/'))
+    # Anything that resolves outside the content directory is never rendered
+    content = os.path.abspath(dir_path_content)
+    if os.path.commonpath([content, os.path.abspath(source)]) != content:
+        return None
+    return source
+
+class RenderServer:
+    def __init__(self, dir_path_content, template_path, basepath, layouts, max_bytes):
+        self.content = dir_path_content
+        self.template = template_path
+        self.basepath = basepath
+        self.layouts = layouts
+        self.cache = PageCache(max_bytes)
+
+    def page(self, source):
+        # Returns (body, etag), rendering on the first request and again after any input changes
+        page_template = select_template(os.path.relpath(source, self.content), self.template, self.layouts)
+        source_stat = os.stat(source)
+        validator = (source_stat.st_mtime_ns, source_stat.st_size, page_template, os.stat(page_template).st_mtime_ns)
+        entry = self.cache.get(source, validator)
+        if entry is not None:
+            return entry[1], entry[2]
+        with open(source, 'r', encoding='utf-8') as f:
+            body = render_markdown(f.read(), page_template, self.basepath, source).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.cache.put(source, validator, body, etag)
+        return body, etag
+
+class RenderRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, render_server=None, **kwargs):
+        self.render_server = render_server
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if not self.send_rendered(True):
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.send_rendered(False):
+            super().do_HEAD()
+
+    def send_rendered(self, include_body):
+        # Pages link to basepath + path, so that prefix is dropped before anything is looked up
+        basepath = self.render_server.basepath
+        url = urlsplit(self.path)
+        if basepath != '/' and (url.path + '/').startswith(basepath):
+            self.path = '/' + self.path[len(basepath):]
+            url = urlsplit(self.path)
+
+        source = page_source(self.render_server.content, url.path)
+        if source is None or not os.path.isfile(source):
+            directory_source = page_source(self.render_server.content, url.path + '/')
+            if not url.path.endswith('/') and directory_source is not None and os.path.isfile(directory_source):
+                self.send_response(301)
+                self.send_header('Location', basepath + url.path[1:] + '/')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return True
+            # Anything that is not a page comes straight from the static directory
+            return False
+        try:
+            body, etag = self.render_server.page(source)
+        except Exception as e:
+            self.send_error(500, f"Failed to render {source}: {type(e).__name__}: {e}")
+            return True
+
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        # Previews change under the reader, so always revalidate; unchanged pages cost a 304
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+        return True
+
+def make_server(render_server, static_path, port):
+    def handler(*args, **kwargs):
+        return RenderRequestHandler(*args, directory=static_path, render_server=render_server, **kwargs)
+    return ThreadingHTTPServer(('localhost', port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the site by rendering pages from ./content on request")
+    parser.add_argument('--port', type=int, default=8889)
+    parser.add_argument('--basepath', default='/')
+    parser.add_argument('--cache-size', type=int, default=64, metavar='MB',
+                        help="memory for rendered pages; least recently used pages are dropped beyond it")
+    parser.add_argument('--layout', action='append', default=[], type=parse_layout, metavar='PATTERN=TEMPLATE',
+                        help="render content files matching PATTERN (e.g. 'blog/**') with TEMPLATE instead of template.html")
+    args = parser.parse_args()
+
+    render_server = RenderServer('./content', 'template.html', args.basepath, args.layout, args.cache_size * 1024 * 1024)
+    server = make_server(render_server, './static', args.port)
+    print(f"Rendering ./content on request at http://localhost:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import sys
+import shutil
+import hashlib
+import argparse
+
+from htmlnode import find_pages, render_page_file, delete_directory, copy_directory
+from incremental import hash_file, load_manifest, save_manifest
+from parallel import render_pages_parallel
+from template import select_template
+from minify import MINIFY_CACHE_DIRECTORY, minify_outputs
+from compress import compress_outputs
+
+SHARD_MANIFEST_NAME = '.shard-manifest.json'
+SHARD_MANIFEST_VERSION = 1
+
+def parse_shard(spec):
+    # "2/8" is the second of eight shards; shards are numbered from 1 like CI matrix jobs
+    index, separator, count = spec.partition('/')
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Shard must look like INDEX/COUNT, got '{spec}'")
+    if separator == '' or count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Shard must look like INDEX/COUNT with 1 <= INDEX <= COUNT, got '{spec}'")
+    return (index, count)
+
+def page_shard(relative_path, count):
+    # sha256 rather than hash(): string hashes are salted per process, so hosts would disagree
+    digest = hashlib.sha256(relative_path.replace(os.sep, '/').encode('utf-8')).hexdigest()
+    return int(digest[:16], 16) % count + 1
+
+def pages_digest(keys):
+    # Every shard records which pages it discovered so the merge can tell whether they all saw one tree
+    digest = hashlib.sha256()
+    for key in sorted(keys):
+        digest.update(key.replace(os.sep, '/').encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+def render_shard(dir_path_content, template_path, dest_dir_path, basepath, shard, jobs=1, layouts=None):
+    index, count = shard
+    if not os.path.exists(dir_path_content):
+        print(f"Error: Source directory not found at '{dir_path_content}'")
+        return []
+    os.makedirs(dest_dir_path, exist_ok=True)
+    delete_directory(dest_dir_path)
+
+    discovered = find_pages(dir_path_content, dest_dir_path)
+    pages = {}
+    jobs_list = []
+    for content_source, content_destination in discovered:
+        key = os.path.relpath(content_source, dir_path_content)
+        if page_shard(key, count) != index:
+            continue
+        page_template = select_template(key, template_path, layouts)
+        jobs_list.append((content_source, page_template, content_destination))
+        pages[key] = {
+            'hash': hash_file(content_source),
+            'dest': os.path.relpath(content_destination, dest_dir_path),
+        }
+
+    if jobs > 1:
+        errors = render_pages_parallel(jobs_list, basepath, jobs)
+    else:
+        errors = []
+        for content_source, page_template, content_destination in jobs_list:
+            os.makedirs(os.path.dirname(content_destination), exist_ok=True)
+            try:
+                render_page_file(content_source, page_template, content_destination, basepath)
+            except Exception as e:
+                errors.append((content_source, f"{type(e).__name__}: {e}"))
+
+    failed = sorted(os.path.relpath(content_source, dir_path_content) for content_source, message in errors)
+    for key in failed:
+        del pages[key]
+    save_manifest(os.path.join(dest_dir_path, SHARD_MANIFEST_NAME), {
+        'version': SHARD_MANIFEST_VERSION,
+        'shard': index,
+        'count': count,
+        'basepath': basepath,
+        'discovered': pages_digest(os.path.relpath(source, dir_path_content) for source, dest in discovered),
+        'pages': pages,
+        'failed': failed,
+    })
+    print(f"Rendered shard {index}/{count}: {len(pages)} of {len(discovered)} discovered pages, {len(failed)} failed")
+    return errors
+
+def check_shards(manifests):
+    # Returns a list of problems; an empty list means the shards form one complete build
+    problems = []
+    first = manifests[0][1]
+    count = first['count']
+    seen = {}
+    for directory, manifest in manifests:
+        for field in ('count', 'basepath', 'discovered'):
+            if manifest[field] != first[field]:
+                problems.append(f"{directory}: {field} differs from {manifests[0][0]}")
+        if manifest['shard'] in seen:
+            problems.append(f"{directory}: shard {manifest['shard']}/{count} already merged from {seen[manifest['shard']]}")
+        seen[manifest['shard']] = directory
+        for key in manifest['failed']:
+            problems.append(f"{directory}: {key} failed to render")
+    for index in range(1, count + 1):
+        if index not in seen:
+            problems.append(f"shard {index}/{count} is missing")
+
+    owners = {}
+    for directory, manifest in manifests:
+        for key, entry in manifest['pages'].items():
+            if key in owners:
+                problems.append(f"{key} was rendered by both {owners[key]} and {directory}")
+            owners[key] = directory
+            if page_shard(key, count) != manifest['shard']:
+                problems.append(f"{directory}: {key} belongs to shard {page_shard(key, count)}/{count}")
+    if not problems and pages_digest(owners) != first['discovered']:
+        problems.append("the merged pages do not match the pages the shards discovered")
+    return problems
+
+def merge_shards(shard_dirs, static_path, dest_dir_path, minify=False, gzip=False, cache_directory=MINIFY_CACHE_DIRECTORY):
+    # Minifying and compressing run once on the merged tree, so static files get them too
+    manifests = []
+    problems = []
+    for directory in shard_dirs:
+        manifest = load_manifest(os.path.join(directory, SHARD_MANIFEST_NAME), SHARD_MANIFEST_VERSION)
+        if manifest is None:
+            problems.append(f"{directory}: no shard manifest")
+        else:
+            manifests.append((directory, manifest))
+    if manifests:
+        problems.extend(check_shards(manifests))
+    if problems:
+        return problems
+
+    delete_directory(dest_dir_path)
+    copy_directory(static_path, dest_dir_path)
+    copied = 0
+    for directory, manifest in manifests:
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                source_path = os.path.join(root, name)
+                relative = os.path.relpath(source_path, directory)
+                if relative == SHARD_MANIFEST_NAME:
+                    continue
+                dest_path = os.path.join(dest_dir_path, relative)
+                if os.path.exists(dest_path):
+                    problems.append(f"{directory}: {relative} would overwrite an existing output")
+                    continue
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                shutil.copy2(source_path, dest_path)
+                copied += 1
+    print(f"Merged {len(manifests)} shards into {dest_dir_path}: {copied} files")
+    if minify:
+        minify_outputs(dest_dir_path, cache_directory)
+    if gzip:
+        compress_outputs(dest_dir_path, os.cpu_count())
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the outputs of main.py --shard runs into ./docs")
+    parser.add_argument('shard_dirs', nargs='+', metavar='SHARD_DIR')
+    parser.add_argument('--static', default='./static')
+    parser.add_argument('--dest', default='./docs')
+    parser.add_argument('--minify', action='store_true',
+                        help="strip insignificant whitespace from the merged html and css (cached in .cache/minify)")
+    parser.add_argument('--gzip', action='store_true',
+                        help="write .gz sidecars next to compressible merged outputs")
+    args = parser.parse_args()
+
+    problems = merge_shards(args.shard_dirs, args.static, args.dest, args.minify, args.gzip)
+    if problems:
+        print(f"{len(problems)} problem(s) merging shards:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
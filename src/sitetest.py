@@ -0,0 +1,25 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+class SiteTestCase(unittest.TestCase):
+    # Each test gets a scratch directory to lay out content, static files and outputs in
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(text, bytes):
+            with open(path, 'wb') as f:
+                f.write(text)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
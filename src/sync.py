@@ -0,0 +1,109 @@
+import os
+import shutil
+
+from incremental import hash_file, load_manifest, save_manifest, remove_output
+
+SYNC_MANIFEST_NAME = '.static-manifest.json'
+SYNC_MANIFEST_VERSION = 2
+SYNC_MODES = ('copy', 'hardlink', 'reflink')
+
+def find_assets(source):
+    assets = []
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            assets.append(os.path.relpath(os.path.join(root, name), source))
+    return assets
+
+def is_current(source_path, source_stat, dest_path):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+    # Same size but a different mtime, e.g. after a fresh checkout: only the contents can tell.
+    # Matching files take over the source mtime so the next build only needs a stat
+    if hash_file(source_path) != hash_file(dest_path):
+        return False
+    shutil.copystat(source_path, dest_path)
+    return True
+
+def reflink_file(source_path, dest_path):
+    # copy_file_range lets the kernel share extents (reflink) or copy in-kernel without
+    # passing the data through user space
+    with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(source_path, dest_path)
+
+def place_file(source_path, dest_path, mode):
+    if os.path.lexists(dest_path):
+        os.unlink(dest_path)
+    try:
+        if mode == 'hardlink':
+            os.link(source_path, dest_path)
+            return
+        if mode == 'reflink' and hasattr(os, 'copy_file_range'):
+            reflink_file(source_path, dest_path)
+            return
+    except OSError as e:
+        # Cross-device links and filesystems without copy_file_range fall back to a plain copy
+        print(f"Falling back to copy for {source_path}: {e}")
+        if os.path.lexists(dest_path):
+            os.unlink(dest_path)
+    shutil.copy2(source_path, dest_path)
+
+def sync_directory(source, destination, mode='copy'):
+    if mode not in SYNC_MODES:
+        raise ValueError(f"Unknown sync mode '{mode}', expected one of {', '.join(SYNC_MODES)}")
+    if not os.path.exists(source):
+        print(f"Error: Source directory not found at '{source}'")
+        return
+    os.makedirs(destination, exist_ok=True)
+
+    manifest_path = os.path.join(destination, SYNC_MANIFEST_NAME)
+    previous = load_manifest(manifest_path, SYNC_MANIFEST_VERSION)
+    # Relative path -> {'stamp': [mtime_ns, size], 'hash': sha256} of the source when it was placed
+    previous_assets = {} if previous is None else previous['assets']
+
+    assets = {}
+    copied = 0
+    for relative in find_assets(source):
+        source_path = os.path.join(source, relative)
+        dest_path = os.path.join(destination, relative)
+        source_stat = os.stat(source_path)
+        stamp = [source_stat.st_mtime_ns, source_stat.st_size]
+        # Placed outputs are judged by the source they came from, not by their own size, so
+        # files rewritten after placement (minified css, say) are not copied again
+        record = previous_assets.get(relative)
+        placed = record is not None and os.path.exists(dest_path)
+        if placed and record['stamp'] == stamp:
+            assets[relative] = record
+            continue
+        digest = hash_file(source_path)
+        assets[relative] = {'stamp': stamp, 'hash': digest}
+        if placed and record['hash'] == digest:
+            continue
+        if record is None and is_current(source_path, source_stat, dest_path):
+            continue
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        place_file(source_path, dest_path, mode)
+        copied += 1
+
+    removed = 0
+    for relative in previous_assets:
+        if relative not in assets:
+            remove_output(os.path.join(destination, relative), destination)
+            removed += 1
+
+    save_manifest(manifest_path, {'version': SYNC_MANIFEST_VERSION, 'assets': assets})
+    print(f"Synced {source} to {destination}: {copied} copied, {removed} removed, {len(assets) - copied} unchanged")
@@ -0,0 +1,64 @@
+import os
+import re
+import fnmatch
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+class Template:
+    def __init__(self, text):
+        self.text = text
+        # Even positions hold static text, odd positions hold (slot name, original placeholder)
+        self.segments = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self.segments.append(text[position:match.start()])
+            self.segments.append((match.group(1), match.group()))
+            position = match.end()
+        self.segments.append(text[position:])
+
+    def slots(self):
+        return [segment[0] for segment in self.segments[1::2]]
+
+    def render(self, values, out):
+        # Values are strings or callables that write their own content; placeholders
+        # without a value are written back unchanged
+        write = out.append if isinstance(out, list) else out.write
+        segments = self.segments
+        write(segments[0])
+        for index in range(1, len(segments), 2):
+            name, placeholder = segments[index]
+            value = values.get(name, placeholder)
+            if callable(value):
+                value(write)
+            else:
+                write(value)
+            write(segments[index + 1])
+
+    def __repr__(self):
+        return f"Template({self.slots()})"
+
+# Compiled templates keyed by path, each stored with the mtime it was compiled from
+_template_cache = {}
+
+def load_template(template_path):
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _template_cache.get(template_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(template_path, 'r', encoding='utf-8') as t:
+        template = Template(t.read())
+    _template_cache[template_path] = (mtime, template)
+    return template
+
+def parse_layout(spec):
+    pattern, separator, template_path = spec.partition('=')
+    if separator == '' or pattern == '' or template_path == '':
+        raise ValueError(f"Layout must look like PATTERN=TEMPLATE, got '{spec}'")
+    return (pattern, template_path)
+
+def select_template(relative_path, template_path, layouts):
+    relative_path = relative_path.replace(os.sep, '/')
+    for pattern, layout_path in layouts or ():
+        if fnmatch.fnmatchcase(relative_path, pattern):
+            return layout_path
+    return template_path
@@ -0,0 +1,74 @@
+import os
+import json
+import tarfile
+import zipfile
+import unittest
+
+from archive import write_archive, archive_format
+from htmlnode import generate_pages_recursive
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestArchive(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('static', 'index.css'), "body { margin: 0 }")
+        self.write(self.path('static', 'images', 'a.png'), "png")
+        self.write(self.path('content', 'index.md'), "# Home")
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post\n\nText")
+
+    def build(self, name):
+        archive_path = self.path(name)
+        errors = write_archive(archive_path, self.path('static'), self.path('content'), self.path('template.html'), '/site/')
+        self.assertEqual(errors, [])
+        with open(archive_path + '.index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        with open(archive_path, 'rb') as f:
+            return f.read(), index
+
+    def expected(self, name):
+        generate_pages_recursive(self.path('content'), self.path('template.html'), self.path('docs'), '/site/')
+        with open(self.path('docs', name), 'rb') as f:
+            return f.read()
+
+    def test_archive_format(self):
+        self.assertEqual(archive_format("site.tar.gz"), ".tar.gz")
+        with self.assertRaises(ValueError):
+            archive_format("site.rar")
+
+    def test_tar_offsets(self):
+        data, index = self.build('site.tar')
+        self.assertEqual(sorted(index['entries']), ['blog/post/index.html', 'images/a.png', 'index.css', 'index.html'])
+        entry = index['entries']['blog/post/index.html']
+        self.assertEqual(data[entry['offset']:entry['offset'] + entry['size']], self.expected('blog/post/index.html'))
+        with tarfile.open(self.path('site.tar')) as tar:
+            self.assertEqual(tar.getnames(), sorted(index['entries']))
+            self.assertEqual({member.mtime for member in tar.getmembers()}, {315532800})
+
+    def test_zip_offsets(self):
+        data, index = self.build('site.zip')
+        stored = index['entries']['images/a.png']
+        self.assertEqual(stored['method'], 'store')
+        self.assertEqual(data[stored['offset']:stored['offset'] + stored['size']], b"png")
+        self.assertEqual(index['entries']['index.html']['method'], 'deflate')
+        with zipfile.ZipFile(self.path('site.zip')) as archive:
+            self.assertEqual(archive.read('index.html'), self.expected('index.html'))
+
+    def test_reproducible(self):
+        for name in ('site.tar.gz', 'site.zip'):
+            first = self.build(name)
+            os.utime(self.path('content', 'index.md'), (0, 0))
+            self.assertEqual(self.build(name), first)
+
+    def test_failed_pages_are_left_out(self):
+        self.write(self.path('content', 'broken.md'), "no title")
+        errors = write_archive(self.path('site.tar'), self.path('static'), self.path('content'), self.path('template.html'), '/')
+        self.assertEqual([source for source, message in errors], [self.path('content', 'broken.md')])
+        with tarfile.open(self.path('site.tar')) as tar:
+            self.assertNotIn('broken.html', tar.getnames())
+
+if __name__ == "__main__":
+    unittest.main()
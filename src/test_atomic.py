@@ -0,0 +1,35 @@
+import os
+import unittest
+
+from atomic import atomic_open, write_atomic
+from sitetest import SiteTestCase
+
+class TestAtomicWrite(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.target = self.path('state.json')
+
+    def read(self):
+        with open(self.target, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_overlapping_writers_do_not_share_a_file(self):
+        with atomic_open(self.target, 'w', 'utf-8') as first:
+            with atomic_open(self.target, 'w', 'utf-8') as second:
+                first.write("first")
+                second.write("second")
+        self.assertEqual(self.read(), "first")
+        self.assertEqual(os.listdir(self.root), ['state.json'])
+
+    def test_failed_write_keeps_the_old_file(self):
+        write_atomic(self.target, "old")
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.target, 'w', 'utf-8') as f:
+                f.write("new")
+                raise RuntimeError("interrupted")
+        self.assertEqual(self.read(), "old")
+        self.assertEqual(os.listdir(self.root), ['state.json'])
+
+if __name__ == "__main__":
+    unittest.main()
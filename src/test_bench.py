@@ -0,0 +1,31 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from bench.corpus import generate_corpus, generate_markdown, SHAPES
+from htmlnode import find_pages, markdown_to_html_node
+
+class TestCorpus(unittest.TestCase):
+
+    def test_seeded_markdown_is_reproducible(self):
+        for shape in SHAPES:
+            first = generate_markdown(random.Random(7), shape, 3000)
+            self.assertEqual(first, generate_markdown(random.Random(7), shape, 3000))
+            self.assertGreaterEqual(len(first), 3000)
+            markdown_to_html_node(first)
+
+    def test_corpus_layout(self):
+        directory = tempfile.mkdtemp()
+        try:
+            total = generate_corpus(directory, pages=20, page_size=500, depth=3, fanout=2, seed=1)
+            pages = find_pages(directory, 'docs')
+            self.assertEqual(len(pages), 20)
+            self.assertEqual(total, sum(os.path.getsize(source) for source, dest in pages))
+            self.assertEqual(os.path.relpath(pages[0][0], directory).count(os.sep), 4)
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    unittest.main()
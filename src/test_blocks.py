@@ -0,0 +1,78 @@
+import unittest
+
+from blocks import Block, BlockType, parse_blocks
+from htmlnode import markdown_to_html_node
+
+class TestParseBlocks(unittest.TestCase):
+
+    def parse(self, markdown):
+        return list(parse_blocks(markdown.split('\n')))
+
+    def test_block_types(self):
+        md = """
+## Heading
+
+Paragraph line one
+line two
+
+> quoted
+>
+> -- author
+
+- first
+- second
+
+1. one
+2. two
+3. three
+"""
+        self.assertListEqual(
+            [
+                Block(BlockType.HEADING, ["Heading"], 2),
+                Block(BlockType.PARAGRAPH, ["Paragraph line one line two"]),
+                Block(BlockType.QUOTE, ["quoted", "", "-- author"]),
+                Block(BlockType.UNORDERED_LIST, ["first", "second"]),
+                Block(BlockType.ORDERED_LIST, ["one", "two", "three"]),
+            ],
+            self.parse(md),
+        )
+
+    def test_misnumbered_list_is_paragraph(self):
+        self.assertListEqual(
+            [Block(BlockType.PARAGRAPH, ["1. one 3. three"])],
+            self.parse("1. one\n3. three"),
+        )
+
+    def test_list_items_keep_leading_characters(self):
+        self.assertListEqual(
+            [
+                Block(BlockType.ORDERED_LIST, ["1984 was a year", "11 more"]),
+                Block(BlockType.UNORDERED_LIST, ["-5 degrees"]),
+            ],
+            self.parse("1. 1984 was a year\n2. 11 more\n\n- -5 degrees"),
+        )
+
+    def test_code_with_blank_lines(self):
+        md = "Intro\n```\ndef f():\n\n    return 1\n```\nAfter"
+        self.assertListEqual(
+            [
+                Block(BlockType.PARAGRAPH, ["Intro"]),
+                Block(BlockType.CODE, ["def f():\n\n    return 1\n"]),
+                Block(BlockType.PARAGRAPH, ["After"]),
+            ],
+            self.parse(md),
+        )
+
+    def test_lines_with_newlines(self):
+        lines = ["# Title\n", "\n", "text\n"]
+        self.assertListEqual(
+            [Block(BlockType.HEADING, ["Title"], 1), Block(BlockType.PARAGRAPH, ["text"])],
+            list(parse_blocks(iter(lines))),
+        )
+
+    def test_html_for_code_with_blank_lines(self):
+        node = markdown_to_html_node("```\na\n\nb\n```")
+        self.assertEqual(node.to_html(), "<div><pre><code>a\n\nb\n</code>\n</pre>\n</div>\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import buildtrace
+from buildtrace import start_tracing, stop_tracing, span, phase_summary, write_chrome_trace
+from htmlnode import markdown_to_html_node
+from parallel import generate_pages_parallel
+
+class TestBuildTrace(unittest.TestCase):
+
+    def tearDown(self):
+        stop_tracing()
+
+    def test_disabled_records_nothing(self):
+        self.assertIsNone(buildtrace._tracer)
+        with span('parse') as args:
+            args['ignored'] = True
+        markdown_to_html_node("# Title")
+        self.assertIsNone(stop_tracing())
+
+    def test_phase_counts(self):
+        tracer = start_tracing()
+        markdown_to_html_node("# Title\n\n- one\n- two")
+        stop_tracing()
+        self.assertEqual(phase_summary(tracer)['inline'][0], 3)
+
+    def test_chrome_trace(self):
+        tracer = start_tracing()
+        with span('page', source='index.md'):
+            pass
+        stop_tracing()
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'trace.json')
+            write_chrome_trace(tracer, path)
+            with open(path) as f:
+                event = json.load(f)['traceEvents'][0]
+            self.assertEqual((event['name'], event['ph'], event['args']), ('page', 'X', {'source': 'index.md'}))
+            self.assertGreaterEqual(event['dur'], 0)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_worker_events_are_collected(self):
+        directory = tempfile.mkdtemp()
+        try:
+            content = os.path.join(directory, 'content')
+            template = os.path.join(directory, 'template.html')
+            os.makedirs(content)
+            with open(template, 'w') as f:
+                f.write("{{ Title }}{{ Content }}")
+            for name in ('a', 'b', 'c'):
+                with open(os.path.join(content, name + '.md'), 'w') as f:
+                    f.write(f"# {name}")
+            tracer = start_tracing()
+            generate_pages_parallel(content, template, os.path.join(directory, 'docs'), '/', 2)
+            stop_tracing()
+            pages = [event for event in tracer.events if event[0] == 'page']
+            self.assertEqual(len(pages), 3)
+            self.assertEqual(pages[0][4]['chars_in'], 3)
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    unittest.main()
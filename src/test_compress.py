@@ -0,0 +1,52 @@
+import os
+import gzip
+import unittest
+
+from compress import compress_outputs, compress_file
+from sitetest import SiteTestCase
+
+class TestCompressOutputs(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('index.html'), "<p>repeated text</p>\n" * 200)
+        self.write(self.path('css', 'index.css'), "body { margin: 0; }\n" * 100)
+        self.write(self.path('tiny.css'), "a{}")
+        self.write(self.path('images', 'photo.png'), "\x89PNG" * 100)
+
+    def test_writes_sidecars_for_compressible_outputs(self):
+        counts = compress_outputs(self.root, 2)
+        self.assertEqual(counts, {'compressed': 2, 'current': 0, 'skipped': 1})
+        with gzip.open(self.path('index.html.gz'), 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "<p>repeated text</p>\n" * 200)
+        self.assertTrue(os.path.exists(self.path('css', 'index.css.gz')))
+        self.assertFalse(os.path.exists(self.path('tiny.css.gz')))
+        self.assertFalse(os.path.exists(self.path('images', 'photo.png.gz')))
+
+    def test_current_sidecars_are_kept(self):
+        compress_outputs(self.root)
+        self.assertEqual(compress_file(self.path('index.html')), 'current')
+        self.write(self.path('index.html'), "<p>changed</p>\n" * 200)
+        self.assertEqual(compress_file(self.path('index.html')), 'compressed')
+        with gzip.open(self.path('index.html.gz'), 'rt', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "<p>changed</p>\n" * 200)
+
+    def test_output_is_reproducible(self):
+        compress_outputs(self.root)
+        with open(self.path('index.html.gz'), 'rb') as f:
+            first = f.read()
+        os.unlink(self.path('index.html.gz'))
+        compress_outputs(self.root)
+        with open(self.path('index.html.gz'), 'rb') as f:
+            self.assertEqual(f.read(), first)
+
+    def test_removes_orphaned_sidecars(self):
+        compress_outputs(self.root)
+        os.unlink(self.path('css', 'index.css'))
+        self.write(self.path('archive.tar.gz'), "not ours")
+        compress_outputs(self.root)
+        self.assertFalse(os.path.exists(self.path('css', 'index.css.gz')))
+        self.assertTrue(os.path.exists(self.path('archive.tar.gz')))
+
+if __name__ == "__main__":
+    unittest.main()
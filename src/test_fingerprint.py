@@ -0,0 +1,79 @@
+import os
+import unittest
+
+from fingerprint import fingerprint_assets, fingerprint_name, rewrite_css
+from render import RenderContext, rewrite_references, configure_assets, asset_template
+from htmlnode import render_page_file, LeafNode
+from sitetest import SiteTestCase
+
+class TestRewriting(unittest.TestCase):
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name('images/tom.png', 'abcdef0123456789'), 'images/tom.abcdef0123.png')
+
+    def test_rewrite_css(self):
+        assets = {'/images/a.png': '/images/a.111.png', '/fonts/b.woff2': '/fonts/b.222.woff2'}
+        css = "a { background: url('../images/a.png'); } @font-face { src: url(/fonts/b.woff2?v=2#x) } b { background: url(data:image/png;base64,AA) }"
+        self.assertEqual(
+            rewrite_css(css, '/css/site.css', assets),
+            "a { background: url('../images/a.111.png'); } @font-face { src: url(/fonts/b.222.woff2?v=2#x) } b { background: url(data:image/png;base64,AA) }",
+        )
+
+    def test_rewrite_references(self):
+        assets = {'/index.css': '/index.333.css'}
+        html = '<link href="/index.css" rel="stylesheet" /><a href="/other.css">x</a>'
+        self.assertEqual(rewrite_references(html, assets), '<link href="/index.333.css" rel="stylesheet" /><a href="/other.css">x</a>')
+
+    def test_resolver_maps_then_rebases(self):
+        context = RenderContext('/site/', assets={'/images/a.png': '/images/a.111.png'})
+        node = LeafNode("img", "", {"src": "/images/a.png"})
+        self.assertEqual(node.to_html(context), '<img src="/site/images/a.111.png"></img>')
+
+class TestFingerprintAssets(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('static', 'images', 'a.png'), "png")
+        self.write(self.path('static', 'css', 'site.css'), "body { background: url(../images/a.png) }")
+        self.write(self.path('template.html'), '<link href="/css/site.css" rel="stylesheet" />{{ Content }}')
+        self.write(self.path('page.md'), "# Title\n\n![a](/images/a.png)")
+
+    def tearDown(self):
+        configure_assets(None)
+        super().tearDown()
+
+    def read(self, *parts):
+        with open(self.path(*parts), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_hashed_copies_and_page_references(self):
+        assets = fingerprint_assets(self.path('static'), self.path('docs'))
+        image = assets['/images/a.png']
+        stylesheet = assets['/css/site.css']
+        self.assertEqual(self.read('docs', image[1:]), "png")
+        self.assertEqual(self.read('docs', stylesheet[1:]), f"body {{ background: url(../{image[1:]}) }}")
+        self.assertFalse(os.path.exists(self.path('docs', 'images', 'a.png')))
+
+        configure_assets(assets)
+        render_page_file(self.path('page.md'), self.path('template.html'), self.path('docs', 'page.html'), '/')
+        page = self.read('docs', 'page.html')
+        self.assertIn(f'href="{stylesheet}"', page)
+        self.assertIn(f'src="{image}"', page)
+
+    def test_changed_image_renames_stylesheet(self):
+        first = fingerprint_assets(self.path('static'), self.path('docs'))
+        self.write(self.path('static', 'images', 'a.png'), "new png")
+        second = fingerprint_assets(self.path('static'), self.path('docs'))
+        self.assertNotEqual(first['/images/a.png'], second['/images/a.png'])
+        self.assertNotEqual(first['/css/site.css'], second['/css/site.css'])
+        self.assertFalse(os.path.exists(self.path('docs', first['/images/a.png'][1:])))
+        self.assertFalse(os.path.exists(self.path('docs', first['/css/site.css'][1:])))
+
+    def test_template_rewrite_is_cached(self):
+        configure_assets({'/css/site.css': '/css/site.444.css'})
+        template = asset_template(self.path('template.html'))
+        self.assertIs(asset_template(self.path('template.html')), template)
+        self.assertEqual(template.segments[0], '<link href="/css/site.444.css" rel="stylesheet" />')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import io
+import unittest
+
+from frontmatter import parse_front_matter, read_front_matter, split_front_matter, configure_metadata
+from metadata import build_metadata_index
+from htmlnode import render_page_file
+from incremental import generate_pages_incremental
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><time>{{ Date }}</time><body>{{ Content }}{{ Collection }}</body>"
+
+class TestFrontMatter(unittest.TestCase):
+
+    def test_parse_front_matter(self):
+        meta = parse_front_matter([
+            "title: \"Tolkien: a life\"\n",
+            "# a comment\n",
+            "Date: 2024-05-01\n",
+            "tags: [books, 'middle earth']\n",
+            "authors:\n",
+            "  - Tom\n",
+            "  - Ann\n",
+        ])
+        self.assertEqual(meta, {
+            'title': "Tolkien: a life",
+            'date': "2024-05-01",
+            'tags': ["books", "middle earth"],
+            'authors': ["Tom", "Ann"],
+        })
+        with self.assertRaises(ValueError):
+            parse_front_matter(["not a pair\n"])
+
+    def test_read_stops_after_header(self):
+        f = io.StringIO("---\ntitle: Post\n---\n# Heading\n\nBody\n")
+        meta, pending = read_front_matter(f)
+        self.assertEqual((meta, pending), ({'title': "Post"}, []))
+        self.assertEqual(f.readline(), "# Heading\n")
+
+    def test_split_front_matter(self):
+        self.assertEqual(split_front_matter("---\ntags: [a]\n---\n# Post\n"), ({'tags': ["a"]}, "# Post\n"))
+        self.assertEqual(split_front_matter("# Post\n"), ({}, "# Post\n"))
+        # A leading thematic break without a closing fence is part of the body
+        self.assertEqual(split_front_matter("---\n# Post\n"), ({}, "---\n# Post\n"))
+        # So is text between two thematic breaks that is not a header
+        self.assertEqual(split_front_matter("---\nJust a paragraph\n---\n"), ({}, "---\nJust a paragraph\n---\n"))
+
+class TestMetadataIndex(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('content', 'blog', 'index.md'), "---\ncollection: blog\n---\n# Blog")
+        self.write(self.path('content', 'blog', 'old', 'index.md'), "---\ndate: 2023-01-02\ntags: [a]\n---\n# Old post")
+        self.write(self.path('content', 'blog', 'new', 'index.md'), "---\ntitle: New & shiny\ndate: 2024-03-04\n---\nBody")
+        self.write(self.path('content', 'about.md'), "```\n# not a title\n```\n\n# About")
+
+    def tearDown(self):
+        configure_metadata(None)
+        super().tearDown()
+
+    def read(self, *parts):
+        with open(self.path(*parts), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_index_entries(self):
+        index = build_metadata_index(self.path('content'), self.path('cache.json'))
+        self.assertEqual(index.entries['about.md']['title'], "About")
+        self.assertEqual(index.entries['blog/old/index.md'], {
+            'title': "Old post", 'date': "2023-01-02", 'tags': ["a"], 'url': "/blog/old/", 'collection': None,
+        })
+        self.assertEqual([entry['url'] for entry in index.collection('blog', 'blog/index.md')], ["/blog/new/", "/blog/old/"])
+
+    def test_collection_list_is_a_page_error(self):
+        self.write(self.path('content', 'blog', 'index.md'), "---\ncollection:\n  - blog\n---\n# Blog")
+        index = build_metadata_index(self.path('content'), None)
+        self.assertNotIn('blog/index.md', index.entries)
+        self.assertIn('blog/old/index.md', index.entries)
+        configure_metadata(index)
+        with self.assertRaises(ValueError):
+            render_page_file(self.path('content', 'blog', 'index.md'), self.path('template.html'), self.path('index.html'), '/')
+
+    def test_cached_entries_are_not_read_again(self):
+        build_metadata_index(self.path('content'), self.path('cache.json'))
+        source = self.path('content', 'about.md')
+        stat = os.stat(source)
+        # Same size and mtime: the stale cache entry wins, which shows the file was not opened
+        self.write(source, "```\n# not a title\n```\n\n# Abort")
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        index = build_metadata_index(self.path('content'), self.path('cache.json'))
+        self.assertEqual(index.entries['about.md']['title'], "About")
+
+    def test_rendered_collection_and_title(self):
+        configure_metadata(build_metadata_index(self.path('content'), None))
+        render_page_file(self.path('content', 'blog', 'index.md'), self.path('template.html'), self.path('index.html'), '/site/')
+        self.assertEqual(self.read('index.html'),
+            "<title>Blog</title><time></time><body><div><h1 id=\"blog\">Blog</h1>\n</div>\n"
+            "<ul class=\"collection\">\n"
+            "<li><a href=\"/site/blog/new/\">New &amp; shiny</a> <time datetime=\"2024-03-04\">2024-03-04</time></li>\n"
+            "<li><a href=\"/site/blog/old/\">Old post</a> <time datetime=\"2023-01-02\">2023-01-02</time></li>\n"
+            "</ul>\n</body>")
+        render_page_file(self.path('content', 'blog', 'new', 'index.md'), self.path('template.html'), self.path('new.html'), '/')
+        self.assertEqual(self.read('new.html'), "<title>New &amp; shiny</title><time>2024-03-04</time><body><div><p>Body</p>\n</div>\n</body>")
+
+    def test_incremental_rebuilds_collection_pages(self):
+        configure_metadata(build_metadata_index(self.path('content'), self.path('cache.json')))
+        generate_pages_incremental(self.path('content'), self.path('template.html'), self.path('docs'), '/')
+        self.write(self.path('content', 'blog', 'new', 'index.md'), "---\ntitle: Renamed\ndate: 2024-03-04\n---\nBody")
+        configure_metadata(build_metadata_index(self.path('content'), self.path('cache.json')))
+        generate_pages_incremental(self.path('content'), self.path('template.html'), self.path('docs'), '/')
+        self.assertIn(">Renamed</a>", self.read('docs', 'blog', 'index.html'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,5 @@
+import io
+import sys
 import unittest
 from htmlnode import *
 
@@ -20,6 +22,36 @@ class TestHTMLNode(unittest.TestCase):
         printout = str(node)
         self.assertEqual(printout, "HTMLNode \n Tag: p, Value: This is a text, Children: None, Props: {'style': 'left', 'width': '200'}")
 
+class TestCompactNodes(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        for node in [HTMLNode(), LeafNode("b", "x"), ParentNode("p", [])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_props_stored_as_tuple(self):
+        node = LeafNode("a", "link", {"href": "/x", "rel": "next"})
+        self.assertEqual(node._props, (("href", "/x"), ("rel", "next")))
+        self.assertEqual(node.props, {"href": "/x", "rel": "next"})
+        self.assertEqual(node.props_to_html(), ' href="/x" rel="next"')
+
+    def test_props_are_read_only(self):
+        node = LeafNode("a", "link", {"href": "/x"})
+        with self.assertRaises(TypeError):
+            node.props["href"] = "/y"
+        node.props = {**node.props, "href": "/y"}
+        self.assertEqual(node.props, {"href": "/y"})
+
+    def test_empty_props_shared(self):
+        self.assertIs(HTMLNode(props={})._props, LeafNode("b", "x", {})._props)
+        self.assertEqual(HTMLNode(props={}).props, {})
+        self.assertEqual(HTMLNode(props={}).props_to_html(), "")
+        self.assertTrue(repr(LeafNode("b", "x", {})).endswith("Props: {}"))
+        self.assertTrue(repr(LeafNode("b", "x")).endswith("Props: None"))
+
+    def test_unknown_text_type(self):
+        with self.assertRaises(ValueError):
+            text_node_to_html_node(TextNode("x", "underline"))
+
 class TestLeafNode(unittest.TestCase):
 
     def test_leaf_to_html_p(self):
@@ -61,6 +93,35 @@ class TestParentNode(unittest.TestCase):
             "<div><span><b>grandchild 1</b><p>grandchild 2</p></span>childless child</div>",
         )    
 
+class TestSerializer(unittest.TestCase):
+
+    def test_chunks_match_to_html(self):
+        node = markdown_to_html_node("# Title\n\nSome **bold** and a [link](/a)\n\n- one\n- two")
+        chunks = []
+        write_html(node, chunks)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_write_to_file_object(self):
+        node = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        out = io.StringIO()
+        write_html(node, out)
+        self.assertEqual(out.getvalue(), "<div><b>bold</b> text</div>\n")
+
+    def test_deep_tree(self):
+        node = LeafNode(None, "leaf")
+        for i in range(5 * sys.getrecursionlimit()):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span><span>"))
+        self.assertIn("leaf</span>\n</span>\n", html)
+
+    def test_render_page_streams_template(self):
+        page = render_page("# Hello\n\n![pic](/a.png)", "<t>{{ Title }}</t>{{ Content }}<end>", "/base/")
+        self.assertEqual(
+            page,
+            '<t>Hello</t><div><h1 id="hello">Hello</h1>\n<p><img src="/base/a.png">pic</img></p>\n</div>\n<end>',
+        )
+
 class TestTexttoLeafConversion(unittest.TestCase):
 
     def test_text(self):
@@ -0,0 +1,84 @@
+import io
+import os
+import struct
+import unittest
+
+from imagesize import image_size, build_image_index
+from htmlnode import LeafNode, render_page_file
+from render import RenderContext, configure_images
+from sitetest import SiteTestCase
+
+def png(width, height):
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + b'\x08\x06\x00\x00\x00'
+
+def jpeg(width, height):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    frame = b'\xff\xc2' + struct.pack('>HBHHB', 11, 8, height, width, 3) + b'\x00' * 3
+    return b'\xff\xd8' + app0 + frame + b'\xff\xda'
+
+class TestImageSize(unittest.TestCase):
+
+    def test_formats(self):
+        vp8x = b'RIFF' + b'\x00' * 4 + b'WEBPVP8X' + b'\x00' * 8 + (639).to_bytes(3, 'little') + (479).to_bytes(3, 'little')
+        vp8l = b'RIFF' + b'\x00' * 4 + b'WEBPVP8L' + b'\x00' * 4 + b'\x2f' + struct.pack('<I', 99 | (49 << 14)) + b'\x00' * 5
+        cases = [
+            (png(640, 480), (640, 480)),
+            (b'GIF89a' + struct.pack('<HH', 32, 16), (32, 16)),
+            (jpeg(1024, 768), (1024, 768)),
+            (vp8x, (640, 480)),
+            (vp8l, (100, 50)),
+            (b'not an image', None),
+            (b'\xff\xd8\xff\xe0\x00', None),
+        ]
+        for data, expected in cases:
+            size = image_size(io.BytesIO(data))
+            self.assertEqual(None if size is None else tuple(size), expected)
+
+    def test_jpeg_reads_headers_only(self):
+        # A segment body is skipped with a seek, never read
+        data = jpeg(20, 10)
+        data = data[:2] + b'\xff\xe1' + struct.pack('>H', 1002) + b'\x00' * 1000 + data[2:]
+        f = io.BytesIO(data)
+        self.assertEqual(image_size(f), (20, 10))
+        self.assertLess(f.tell(), 1100)
+
+class TestImageIndex(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('static', 'images', 'a.png'), png(300, 200))
+        self.write(self.path('static', 'images', 'b.gif'), b'GIF87a' + struct.pack('<HH', 5, 6))
+        self.write(self.path('static', 'index.css'), b'body {}')
+
+    def tearDown(self):
+        configure_images(None)
+        super().tearDown()
+
+    def test_index_is_cached(self):
+        cache_path = self.path('cache', 'images.json')
+        self.assertEqual(build_image_index(self.path('static'), cache_path), {'/images/a.png': [300, 200], '/images/b.gif': [5, 6]})
+        source = self.path('static', 'images', 'a.png')
+        stat = os.stat(source)
+        # Same size and mtime: the cached size wins, which shows the file was not opened
+        self.write(source, png(1, 1))
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(build_image_index(self.path('static'), cache_path)['/images/a.png'], [300, 200])
+
+    def test_img_attributes(self):
+        context = RenderContext('/site/', images={'/images/a.png': [300, 200]})
+        self.assertEqual(LeafNode("img", "pic", {"src": "/images/a.png?v=1"}).to_html(context),
+                         '<img src="/site/images/a.png?v=1" width="300" height="200" loading="lazy" decoding="async">pic</img>')
+        self.assertEqual(LeafNode("img", "", {"src": "https://example.com/b.png"}).to_html(context),
+                         '<img src="https://example.com/b.png" loading="lazy" decoding="async"></img>')
+        self.assertEqual(LeafNode("img", "", {"src": "/images/a.png"}).to_html(RenderContext('/')), '<img src="/images/a.png"></img>')
+
+    def test_rendered_page(self):
+        configure_images(build_image_index(self.path('static'), None))
+        self.write(self.path('template.html'), b"{{ Content }}")
+        self.write(self.path('page.md'), b"# Title\n\n![a](/images/a.png)")
+        render_page_file(self.path('page.md'), self.path('template.html'), self.path('page.html'), '/')
+        with open(self.path('page.html'), 'r', encoding='utf-8') as f:
+            self.assertIn('<img src="/images/a.png" width="300" height="200" loading="lazy" decoding="async">a</img>', f.read())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import unittest
+
+from incremental import generate_pages_incremental, load_manifest, MANIFEST_NAME
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestIncrementalBuild(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, 'content')
+        self.docs = os.path.join(self.root, 'docs')
+        self.template = os.path.join(self.root, 'template.html')
+        self.write(self.template, TEMPLATE)
+        self.write(os.path.join(self.content, 'index.md'), "# Home\n\nWelcome")
+        self.write(os.path.join(self.content, 'blog', 'post', 'index.md'), "# Post\n\nText")
+
+    def build(self, basepath='/'):
+        generate_pages_incremental(self.content, self.template, self.docs, basepath)
+
+    def mtime(self, *parts):
+        return os.stat(os.path.join(self.docs, *parts)).st_mtime_ns
+
+    def touch_old(self, *parts):
+        os.utime(os.path.join(self.docs, *parts), ns=(0, 0))
+
+    def test_first_build_writes_manifest(self):
+        self.build()
+        manifest = load_manifest(os.path.join(self.docs, MANIFEST_NAME))
+        self.assertEqual(sorted(manifest['pages']), ['blog/post/index.md', 'index.md'])
+        self.assertTrue(os.path.exists(os.path.join(self.docs, 'blog', 'post', 'index.html')))
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        self.touch_old('index.html')
+        self.touch_old('blog', 'post', 'index.html')
+        self.write(os.path.join(self.content, 'blog', 'post', 'index.md'), "# Post\n\nEdited")
+        self.build()
+        self.assertEqual(self.mtime('index.html'), 0)
+        self.assertNotEqual(self.mtime('blog', 'post', 'index.html'), 0)
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        self.touch_old('index.html')
+        self.write(self.template, TEMPLATE + "\n")
+        self.build()
+        self.assertNotEqual(self.mtime('index.html'), 0)
+
+    def test_basepath_change_rebuilds_everything(self):
+        self.build()
+        self.touch_old('index.html')
+        self.build('/site/')
+        self.assertNotEqual(self.mtime('index.html'), 0)
+
+    def test_layout_change_rebuilds_only_its_pages(self):
+        layout = os.path.join(self.root, 'blog.html')
+        self.write(layout, "<main>{{ Content }}</main>")
+        layouts = [('blog/**', layout)]
+        generate_pages_incremental(self.content, self.template, self.docs, '/', layouts=layouts)
+        self.touch_old('index.html')
+        self.touch_old('blog', 'post', 'index.html')
+        self.write(layout, "<section>{{ Content }}</section>")
+        generate_pages_incremental(self.content, self.template, self.docs, '/', layouts=layouts)
+        self.assertEqual(self.mtime('index.html'), 0)
+        self.assertNotEqual(self.mtime('blog', 'post', 'index.html'), 0)
+
+    def test_removed_page_output_is_deleted(self):
+        self.build()
+        shutil.rmtree(os.path.join(self.content, 'blog'))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.docs, 'blog')))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, 'index.html')))
+
+if __name__ == "__main__":
+    unittest.main()
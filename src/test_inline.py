@@ -0,0 +1,82 @@
+import unittest
+
+from textnode import TextNode, TextType
+from inline import parse_inline
+from htmlnode import split_nodes_delimiter, split_nodes_link, split_nodes_image
+
+def legacy_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.PLAIN)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_image(nodes)
+    return [node for node in nodes if node.text_type != TextType.PLAIN or node.text != ""]
+
+class TestParseInline(unittest.TestCase):
+
+    def test_matches_legacy_pipeline(self):
+        samples = [
+            "plain text only",
+            "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+            "**bold** at the start and *star italic* at the end *x*",
+            "[one](/a) [two](/b) ![three](/c.png) [four](/d)",
+            "Use arr[0] and **bold** then [the docs](/docs)",
+            "See [1] and `code` then [docs](/d)",
+            "A [note] with _emphasis_ before ![a picture](/p.png)",
+        ]
+        for text in samples:
+            self.assertListEqual(legacy_text_to_textnodes(text), parse_inline(text))
+
+    def test_adjacent_markup(self):
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.BOLD),
+                TextNode("b", TextType.BOLD),
+                TextNode("c", TextType.ITALIC),
+                TextNode("d", TextType.LINK, "/d"),
+            ],
+            parse_inline("**a****b**_c_[d](/d)"),
+        )
+
+    def test_nested_markup_stays_literal(self):
+        self.assertListEqual(
+            [
+                TextNode("italic with **bold**", TextType.ITALIC),
+                TextNode(" and ", TextType.PLAIN),
+                TextNode("[not](/a) _a link_", TextType.CODE),
+            ],
+            parse_inline("_italic with **bold**_ and `[not](/a) _a link_`"),
+        )
+
+    def test_label_starts_at_innermost_bracket(self):
+        self.assertListEqual(
+            [
+                TextNode("arr[0] and [", TextType.PLAIN),
+                TextNode("docs", TextType.LINK, "/d"),
+            ],
+            parse_inline("arr[0] and [[docs](/d)"),
+        )
+        # The old regexes linked "a] b [c" here
+        self.assertListEqual(
+            [
+                TextNode("[a] b ", TextType.PLAIN),
+                TextNode("c", TextType.LINK, "d"),
+                TextNode(" and ![e] f", TextType.PLAIN),
+            ],
+            parse_inline("[a] b [c](d) and ![e] f"),
+        )
+
+    def test_markup_inside_urls(self):
+        self.assertListEqual(
+            [TextNode("docs", TextType.LINK, "/snake_case_page")],
+            parse_inline("[docs](/snake_case_page)"),
+        )
+
+    def test_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            parse_inline("this **never closes")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+
+from htmlnode import generate_pages_recursive, render_page_file
+from linkcheck import start_collecting, stop_collecting, update_link_index, check_links
+from parallel import render_pages_parallel
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestLinkCheck(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('docs', 'images', 'a.png'), "png")
+        self.write(self.path('content', 'index.md'), "# Home\n\n[post](/blog/post) [external](https://boot.dev)\n\n![a](/images/a.png)")
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post\n\n[home](../../) [up](../post/)")
+
+    def tearDown(self):
+        stop_collecting()
+        super().tearDown()
+
+    def build(self):
+        start_collecting()
+        generate_pages_recursive(self.path('content'), self.path('template.html'), self.path('docs'), '/site/')
+        pages = update_link_index(self.path('docs'), self.path('content'), stop_collecting().drain())
+        return check_links(self.path('content'), self.path('docs'), pages)
+
+    def test_valid_links(self):
+        self.assertEqual(self.build(), [])
+
+    def test_reports_dangling_links_with_locations(self):
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post\n\n[gone](/blog/gone/)\n\n![b](/images/b.png) [anchor](/#intro)")
+        source = self.path('content', 'blog', 'post', 'index.md')
+        self.assertEqual(self.build(), [
+            (f"{source}:3", "dangling link", "/blog/gone/"),
+            (f"{source}:5", "missing image", "/images/b.png"),
+            (f"{source}:5", "missing anchor", "/#intro"),
+        ])
+
+    def test_heading_anchors(self):
+        self.write(self.path('content', 'blog', 'post', 'index.md'),
+                   "# Post\n\n## The *Old* Forest\n\n## The Old Forest\n\n[top](#post) [home](/#home) [forest](#the-old-forest-1)")
+        self.assertEqual(self.build(), [])
+        # Every anchor the checker accepted is an id in the page itself
+        with open(self.path('docs', 'blog', 'post', 'index.html'), 'r', encoding='utf-8') as f:
+            page = f.read()
+        for anchor in ('post', 'the-old-forest', 'the-old-forest-1'):
+            self.assertIn(f' id="{anchor}"', page)
+
+    def test_incremental_index_keeps_unrendered_pages(self):
+        self.build()
+        # Only the post is rendered this time; the home page's links come from the stored index
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post\n\n[home](/)")
+        start_collecting()
+        render_page_file(self.path('content', 'blog', 'post', 'index.md'), self.path('template.html'),
+                         self.path('docs', 'blog', 'post', 'index.html'), '/')
+        pages = update_link_index(self.path('docs'), self.path('content'), stop_collecting().drain())
+        self.assertEqual(sorted(pages), [os.path.join('blog', 'post', 'index.md'), 'index.md'])
+        self.assertEqual(pages['index.md']['references'][0], ['link', '/blog/post'])
+        os.unlink(self.path('docs', 'images', 'a.png'))
+        problems = check_links(self.path('content'), self.path('docs'), pages)
+        self.assertEqual([problem[1:] for problem in problems], [("missing image", "/images/a.png")])
+
+    def test_parallel_workers_report_links(self):
+        start_collecting()
+        pages = [
+            (self.path('content', 'index.md'), self.path('template.html'), self.path('docs', 'index.html')),
+            (self.path('content', 'blog', 'post', 'index.md'), self.path('template.html'), self.path('docs', 'blog', 'post', 'index.html')),
+        ]
+        render_pages_parallel(pages, '/', 2)
+        collected = stop_collecting().drain()
+        self.assertEqual(collected[pages[1][0]]['references'], [['link', '../../'], ['link', '../post/']])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import unittest
+from unittest import mock
+
+import minify
+from minify import minify_html, minify_css, minify_outputs
+from sitetest import SiteTestCase
+
+class TestMinifyHtml(unittest.TestCase):
+
+    def test_drops_whitespace_between_blocks(self):
+        html = "<!doctype html>\n<html>\n  <body>\n    <div><p>one</p>\n<ul><li>a</li>\n</ul>\n</div>\n  </body>\n</html>\n"
+        self.assertEqual(minify_html(html), "<!doctype html><html><body><div><p>one</p><ul><li>a</li></ul></div></body></html>")
+
+    def test_keeps_a_space_between_inline_elements(self):
+        self.assertEqual(minify_html("<p>a  <b>b</b>\n  <i>c</i></p>"), "<p>a <b>b</b> <i>c</i></p>")
+
+    def test_preserves_pre_and_code(self):
+        html = "<div>\n<pre><code>x\n    y</code></pre>\n<p>see <code>a  b</code>  here</p>\n</div>"
+        self.assertEqual(minify_html(html), "<div><pre><code>x\n    y</code></pre><p>see <code>a  b</code> here</p></div>")
+
+class TestMinifyCss(unittest.TestCase):
+
+    def test_minify_css(self):
+        css = "/* theme */\nbody {\n  margin: 0 auto;\n  color: red;\n}\n\nh1, h2 > a {\n  content: \"a  ;  }\";\n}\n"
+        self.assertEqual(minify_css(css), 'body{margin:0 auto;color:red}h1,h2>a{content:"a  ;  }"}')
+
+    def test_quotes_inside_comments(self):
+        self.assertEqual(minify_css("/* it's */ a { content: 'a  ;  b'; }"), "a{content:'a  ;  b'}")
+        self.assertEqual(minify_css("a { content: '/* not a comment */' }"), "a{content:'/* not a comment */'}")
+
+    def test_keeps_descendant_pseudo_class(self):
+        self.assertEqual(minify_css("a :hover { color: red }"), "a :hover{color:red}")
+
+class TestMinifyOutputs(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.docs = self.path('docs')
+        self.cache = self.path('cache')
+        self.write(self.path('docs', 'index.html'), "<html>\n  <body>\n    <p>hi</p>\n  </body>\n</html>\n")
+        self.write(self.path('docs', 'index.css'), "body {\n  margin: 0;\n}\n")
+        self.write(self.path('docs', 'image.png'), "  \n  ")
+
+    def read(self, name):
+        with open(os.path.join(self.docs, name), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_minifies_in_place_and_reports_sizes(self):
+        bytes_in, bytes_out = minify_outputs(self.docs, self.cache)
+        self.assertEqual(self.read('index.html'), "<html><body><p>hi</p></body></html>")
+        self.assertEqual(self.read('index.css'), "body{margin:0}")
+        self.assertEqual(self.read('image.png'), "  \n  ")
+        self.assertEqual((bytes_in, bytes_out), (70, 49))
+
+    def test_cached_inputs_are_not_minified_again(self):
+        minify_outputs(self.docs, self.cache)
+        self.write(self.path('docs', 'index.html'), "<html>\n  <body>\n    <p>hi</p>\n  </body>\n</html>\n")
+        with mock.patch.dict(minify.MINIFIERS, {'.html': None, '.css': None}):
+            minify_outputs(self.docs, self.cache)
+        self.assertEqual(self.read('index.html'), "<html><body><p>hi</p></body></html>")
+
+if __name__ == "__main__":
+    unittest.main()
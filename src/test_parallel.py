@@ -0,0 +1,46 @@
+import os
+import unittest
+
+from htmlnode import generate_pages_recursive
+from parallel import generate_pages_parallel
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestParallelBuild(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, 'content')
+        self.template = os.path.join(self.root, 'template.html')
+        self.write(self.template, TEMPLATE)
+        for i in range(12):
+            self.write(os.path.join(self.content, f'post{i}', 'index.md'),
+                       f"# Post {i}\n\nSee [home](/) and ![pic](/images/{i}.png)")
+
+    def read_tree(self, directory):
+        files = {}
+        for root, dirs, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    files[os.path.relpath(path, directory)] = f.read()
+        return files
+
+    def test_matches_serial_build(self):
+        serial = os.path.join(self.root, 'serial')
+        parallel = os.path.join(self.root, 'parallel')
+        generate_pages_recursive(self.content, self.template, serial, '/base/')
+        errors = generate_pages_parallel(self.content, self.template, parallel, '/base/', 4)
+        self.assertEqual(errors, [])
+        self.assertEqual(self.read_tree(serial), self.read_tree(parallel))
+
+    def test_errors_are_collected(self):
+        broken = os.path.join(self.content, 'broken', 'index.md')
+        self.write(broken, "No heading here")
+        errors = generate_pages_parallel(self.content, self.template, os.path.join(self.root, 'out'), '/', 2)
+        self.assertEqual([source for source, message in errors], [broken])
+        self.assertIn('No title found', errors[0][1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import unittest
+from unittest import mock
+
+import htmlnode
+import parsecache
+from htmlnode import encode_tree, decode_tree, markdown_to_html_node, parse_markdown, LeafNode
+from parsecache import ParseCache, configure_parse_cache
+from render import RenderContext
+from sitetest import SiteTestCase
+
+MARKDOWN = """# The **Title**
+
+A paragraph with [a link](/blog) and ![an image](/images/a.png).
+
+> quoted
+
+- one
+- two
+
+```
+code
+```
+"""
+
+class TestTreeEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        node = markdown_to_html_node(MARKDOWN, RenderContext('/base/'))
+        decoded = decode_tree(encode_tree(node))
+        self.assertEqual(decoded.to_html(RenderContext('/base/')), node.to_html(RenderContext('/base/')))
+
+    def test_single_leaf(self):
+        node = LeafNode("b", "bold", {"class": "x"})
+        self.assertEqual(decode_tree(encode_tree(node)).to_html(), node.to_html())
+
+class TestParseCache(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = configure_parse_cache(self.root, 1024 * 1024)
+
+    def tearDown(self):
+        configure_parse_cache(None, 0)
+        super().tearDown()
+
+    def test_hit_skips_parsing(self):
+        first = parse_markdown(MARKDOWN, RenderContext('/'))
+        with mock.patch.object(htmlnode, 'markdown_to_html_node') as parse:
+            context = RenderContext('/')
+            second = parse_markdown(MARKDOWN, context)
+            parse.assert_not_called()
+        self.assertEqual(second.to_html(), first.to_html())
+        self.assertEqual(context.title, "The <b>Title</b>")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_corrupt_entry_is_reparsed(self):
+        key = self.cache.key(MARKDOWN)
+        self.cache.put(key, b"not a tree")
+        node = parse_markdown(MARKDOWN, RenderContext('/'))
+        self.assertEqual(node.to_html(), markdown_to_html_node(MARKDOWN).to_html())
+
+    def test_key_changes_with_source_and_version(self):
+        key = self.cache.key(MARKDOWN)
+        self.assertNotEqual(self.cache.key(MARKDOWN + "\n"), key)
+        with mock.patch.object(parsecache, 'PARSE_CACHE_VERSION', parsecache.PARSE_CACHE_VERSION + 1):
+            self.assertNotEqual(self.cache.key(MARKDOWN), key)
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(self.root, 250)
+        for index, name in enumerate(['first', 'second', 'third']):
+            cache.put(name, b"x" * 100)
+            os.utime(cache.path(name), (index, index))
+        # Reading an entry makes it the most recently used one
+        cache.get('first')
+        self.assertEqual(cache.evict(), 1)
+        self.assertTrue(os.path.exists(cache.path('first')))
+        self.assertFalse(os.path.exists(cache.path('second')))
+        self.assertTrue(os.path.exists(cache.path('third')))
+
+if __name__ == "__main__":
+    unittest.main()
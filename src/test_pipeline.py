@@ -0,0 +1,53 @@
+import os
+import unittest
+from unittest import mock
+
+from htmlnode import render_page_file
+from pipeline import render_pages_async, copy_directory_async
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestPipeline(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.pages = []
+        for index in range(12):
+            source = self.path('content', f'page{index}.md')
+            self.write(source, f"# Page {index}\n\n[home](/) and *text*")
+            self.pages.append((source, self.path('template.html'), self.path('docs', 'nested', f'page{index}.html')))
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_matches_serial_rendering(self):
+        self.assertEqual(render_pages_async(self.pages, '/site/', 3), [])
+        for source, template, dest in self.pages:
+            expected = self.path('expected.html')
+            render_page_file(source, template, expected, '/site/')
+            self.assertEqual(self.read(dest), self.read(expected))
+
+    def test_failures_are_collected(self):
+        self.write(self.pages[3][0], "no title")
+        os.unlink(self.pages[5][0])
+        errors = render_pages_async(self.pages, '/', 2)
+        self.assertEqual(sorted(source for source, message in errors), [self.pages[3][0], self.pages[5][0]])
+        self.assertTrue(os.path.exists(self.pages[4][2]))
+
+    def test_large_sources_are_streamed(self):
+        with mock.patch('pipeline.STREAMING_THRESHOLD', 0):
+            self.assertEqual(render_pages_async(self.pages[:2], '/', 2), [])
+        self.assertIn("<title>Page 1</title>", self.read(self.pages[1][2]))
+
+    def test_copy_directory(self):
+        self.write(self.path('static', 'a.css'), "a")
+        self.write(self.path('static', 'images', 'b.png'), "b")
+        copy_directory_async(self.path('static'), self.path('out'), 2)
+        self.assertEqual(self.read(self.path('out', 'images', 'b.png')), "b")
+        self.assertEqual(self.read(self.path('out', 'a.css')), "a")
+
+if __name__ == "__main__":
+    unittest.main()
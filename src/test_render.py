@@ -0,0 +1,36 @@
+import unittest
+
+from render import RenderContext, basepath_resolver
+from htmlnode import markdown_to_html_node, render_page, LeafNode
+
+class TestRenderContext(unittest.TestCase):
+
+    def test_basepath_resolver(self):
+        resolve = basepath_resolver('/site/')
+        self.assertEqual(resolve('/images/a.png'), '/site/images/a.png')
+        self.assertEqual(resolve('https://boot.dev'), 'https://boot.dev')
+        self.assertEqual(resolve('//cdn.example.com/a.js'), '//cdn.example.com/a.js')
+        self.assertEqual(resolve('relative/page'), 'relative/page')
+
+    def test_code_is_not_rebased(self):
+        md = '# Title\n\n[home](/)\n\n```\n<a href="/raw">\n```'
+        page = render_page(md, "{{ Content }}", '/site/')
+        self.assertIn('<a href="/site/">home</a>', page)
+        self.assertIn('<a href="/raw">', page)
+
+    def test_title_from_first_h1(self):
+        context = RenderContext('/site/')
+        markdown_to_html_node("## Sub\n\n# Main [link](/x)\n\n# Second", context)
+        self.assertEqual(context.title, 'Main <a href="/site/x">link</a>')
+
+    def test_custom_resolver(self):
+        context = RenderContext('/', url_resolver=lambda url: url.upper())
+        node = LeafNode("a", "text", {"href": "/page", "title": "/keep"})
+        self.assertEqual(node.to_html(context), '<a href="/PAGE" title="/keep">text</a>')
+
+    def test_missing_title(self):
+        with self.assertRaises(Exception):
+            render_page("no heading", "{{ Content }}", '/')
+
+if __name__ == "__main__":
+    unittest.main()
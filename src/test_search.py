@@ -0,0 +1,106 @@
+import os
+import json
+import unittest
+
+from unittest import mock
+
+import htmlnode
+import search
+from htmlnode import markdown_to_html_node, generate_pages_recursive, render_page_file
+from parallel import render_pages_parallel
+from searchterms import start_indexing, stop_indexing, tokenize
+from search import build_search_index, page_terms, shard_name, encode_postings
+from sitetest import SiteTestCase
+
+class TestTerms(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Tom's *Bombadil*, 3019!"), ["tom", "s", "bombadil", "3019"])
+
+    def test_page_terms(self):
+        node = markdown_to_html_node("# The **Hobbit**\n\nA hobbit [went](/there) home")
+        title, terms = page_terms(node)
+        self.assertEqual(title, "The Hobbit")
+        self.assertEqual(terms, {'the': [0], 'hobbit': [1, 3], 'a': [2], 'went': [4], 'home': [5]})
+
+    def test_shard_name(self):
+        self.assertEqual(shard_name("hobbit"), "ho")
+        self.assertEqual(shard_name("a"), "a")
+        self.assertEqual(shard_name("éomer"), "_")
+        self.assertEqual(shard_name("_x"), "_")
+
+    def test_encode_postings(self):
+        self.assertEqual(encode_postings({3: [4, 9], 1: [2]}), [1, [2], 3, [4, 5]])
+
+class TestSearchIndex(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('content', 'index.md'), "# Home\n\nWelcome hobbits")
+        self.write(self.path('content', 'blog', 'index.md'), "# Blog\n\nHobbits and wizards")
+
+    def load(self, name):
+        with open(self.path('docs', 'search', name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_writes_meta_and_shards(self):
+        build_search_index(self.path('content'), self.path('docs'), '/site/')
+        meta = self.load('meta.json')
+        self.assertEqual(meta['pages'], [
+            {'url': '/site/', 'title': 'Home'},
+            {'url': '/site/blog/', 'title': 'Blog'},
+        ])
+        self.assertEqual(self.load('ho.json')['hobbits'], [0, [2], 1, [1]])
+        self.assertEqual(self.load('wi.json'), {'wizards': [1, [3]]})
+
+    def test_incremental_update(self):
+        build_search_index(self.path('content'), self.path('docs'), '/')
+        before = os.stat(self.path('docs', 'search', 'ho.json')).st_mtime_ns
+        os.utime(self.path('docs', 'search', 'ho.json'), ns=(0, 0))
+        self.write(self.path('content', 'blog', 'index.md'), "# Blog\n\nHobbits and elves")
+        build_search_index(self.path('content'), self.path('docs'), '/')
+        self.assertNotEqual(before, 0)
+        self.assertEqual(os.stat(self.path('docs', 'search', 'ho.json')).st_mtime_ns, 0)
+        self.assertFalse(os.path.exists(self.path('docs', 'search', 'wi.json')))
+        self.assertEqual(self.load('el.json'), {'elves': [1, [3]]})
+
+    def render_and_index(self, render):
+        self.write(self.path('template.html'), "{{ Content }}")
+        start_indexing()
+        try:
+            render()
+            collected = stop_indexing().drain()
+        finally:
+            stop_indexing()
+        # Terms recorded during the render are used as they are; nothing is parsed again
+        with mock.patch.object(search, 'parse_markdown', side_effect=AssertionError("parsed twice")):
+            build_search_index(self.path('content'), self.path('docs'), '/site/', collected)
+        self.assertEqual(self.load('ho.json')['hobbits'], [0, [2], 1, [1]])
+        self.assertEqual(self.load('meta.json')['pages'][1], {'url': '/site/blog/', 'title': 'Blog'})
+
+    def test_terms_recorded_while_rendering(self):
+        self.render_and_index(lambda: generate_pages_recursive(self.path('content'), self.path('template.html'), self.path('docs'), '/site/'))
+
+    def test_terms_from_streamed_pages_and_workers(self):
+        self.write(self.path('content', 'blog', 'index.md'), "---\ntitle: Blog\n---\n# Weblog\n\nHobbits and wizards")
+        pages = [
+            (self.path('content', 'index.md'), self.path('template.html'), self.path('docs', 'index.html')),
+            (self.path('content', 'blog', 'index.md'), self.path('template.html'), self.path('docs', 'blog', 'index.html')),
+        ]
+        with mock.patch.object(htmlnode, 'STREAMING_THRESHOLD', 0):
+            def render():
+                os.makedirs(self.path('docs', 'blog'), exist_ok=True)
+                for source, template, dest in pages:
+                    render_page_file(source, template, dest, '/site/')
+            self.render_and_index(render)
+        self.render_and_index(lambda: render_pages_parallel(pages, '/site/', 2))
+
+    def test_removed_page_keeps_other_ids(self):
+        build_search_index(self.path('content'), self.path('docs'), '/')
+        os.unlink(self.path('content', 'index.md'))
+        build_search_index(self.path('content'), self.path('docs'), '/')
+        self.assertEqual(self.load('meta.json')['pages'], [None, {'url': '/blog/', 'title': 'Blog'}])
+        self.assertEqual(self.load('ho.json'), {'hobbits': [1, [1]]})
+
+if __name__ == "__main__":
+    unittest.main()
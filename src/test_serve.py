@@ -0,0 +1,98 @@
+import os
+import threading
+import unittest
+from http.client import HTTPConnection
+
+from serve import PageCache, RenderServer, make_server, page_source
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestPageCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = PageCache(10)
+        cache.put('a', 1, b"aaaa", '"a"')
+        cache.put('b', 1, b"bbbb", '"b"')
+        cache.get('a', 1)
+        cache.put('c', 1, b"cccc", '"c"')
+        self.assertIsNone(cache.get('b', 1))
+        self.assertEqual(cache.get('a', 1), (1, b"aaaa", '"a"'))
+        self.assertEqual(cache.size, 8)
+
+    def test_changed_validator_misses(self):
+        cache = PageCache(10)
+        cache.put('a', 1, b"aaaa", '"a"')
+        self.assertIsNone(cache.get('a', 2))
+        self.assertEqual(cache.size, 0)
+
+    def test_page_source(self):
+        self.assertEqual(page_source('content', '/'), os.path.join('content', 'index.md'))
+        self.assertEqual(page_source('content', '/blog/tom/'), os.path.join('content', 'blog', 'tom', 'index.md'))
+        self.assertEqual(page_source('content', '/about.html'), os.path.join('content', 'about.md'))
+        self.assertIsNone(page_source('content', '/index.css'))
+        self.assertEqual(page_source('content', '/../secret.html'), os.path.join('content', 'secret.md'))
+        self.assertIsNone(page_source('content', '../secret.html'))
+        self.assertIsNone(page_source('content', '%2e%2e/secret.html'))
+
+class TestRenderServer(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('content', 'index.md'), "# Home\n\n[post](/blog/post/)")
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post")
+        self.write(self.path('static', 'index.css'), "body {}")
+        render_server = RenderServer(self.path('content'), self.path('template.html'), '/site/', [], 1024 * 1024)
+        self.server = make_server(render_server, self.path('static'), 0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def request(self, path, headers=None):
+        connection = HTTPConnection('localhost', self.server.server_address[1])
+        connection.request('GET', path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_renders_pages_and_serves_static(self):
+        response, body = self.request('/site/')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b'<title>Home</title><body><div><h1 id="home">Home</h1>\n<p><a href="/site/blog/post/">post</a></p>\n</div>\n</body>')
+        response, body = self.request('/site/index.css')
+        self.assertEqual(body, b"body {}")
+
+    def test_redirects_to_directory(self):
+        response, body = self.request('/site/blog/post')
+        self.assertEqual(response.status, 301)
+        self.assertEqual(response.getheader('Location'), '/site/blog/post/')
+
+    def test_conditional_request(self):
+        response, body = self.request('/site/blog/post/')
+        etag = response.getheader('ETag')
+        response, body = self.request('/site/blog/post/', {'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+    def test_paths_outside_content_are_not_rendered(self):
+        self.write(self.path('secret.md'), "# Secret")
+        for path in ('../secret.html', '%2e%2e/secret.html'):
+            response, body = self.request(path)
+            self.assertEqual(response.status, 404)
+            self.assertNotIn(b"Secret", body)
+
+    def test_changed_source_is_rerendered(self):
+        response, body = self.request('/site/blog/post/')
+        etag = response.getheader('ETag')
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Edited post")
+        response, body = self.request('/site/blog/post/', {'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"<title>Edited post</title>", body)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import unittest
+
+from shard import parse_shard, page_shard, render_shard, merge_shards
+from htmlnode import generate_pages_recursive, copy_directory
+from minify import minify_outputs
+from compress import compress_outputs
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestShardAssignment(unittest.TestCase):
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/8"), (2, 8))
+        for spec in ("0/8", "9/8", "2", "a/b", "1/0"):
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_page_shard_is_stable(self):
+        # Fixed values: every host and Python process must agree on them
+        self.assertEqual([page_shard(f"blog/{index}/index.md", 4) for index in range(6)], [3, 3, 4, 4, 3, 2])
+
+class TestShardedBuild(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('static', 'index.css'), "body {}")
+        for index in range(8):
+            self.write(self.path('content', f'page{index}', 'index.md'), f"# Page {index}")
+
+    def render(self, index, count):
+        directory = self.path('shards', str(index))
+        render_shard(self.path('content'), self.path('template.html'), directory, '/', (index, count))
+        return directory
+
+    def test_merge_matches_single_build(self):
+        shard_dirs = [self.render(index, 3) for index in (1, 2, 3)]
+        self.assertEqual(merge_shards(shard_dirs, self.path('static'), self.path('docs')), [])
+        generate_pages_recursive(self.path('content'), self.path('template.html'), self.path('expected'), '/')
+        for index in range(8):
+            relative = os.path.join(f'page{index}', 'index.html')
+            with open(self.path('docs', relative)) as merged, open(self.path('expected', relative)) as expected:
+                self.assertEqual(merged.read(), expected.read())
+        self.assertTrue(os.path.exists(self.path('docs', 'index.css')))
+
+    def test_merge_minifies_and_compresses_like_single_build(self):
+        self.write(self.path('static', 'index.css'), "body {\n    margin: 0;\n}\n" * 100)
+        shard_dirs = [self.render(index, 2) for index in (1, 2)]
+        self.assertEqual(merge_shards(shard_dirs, self.path('static'), self.path('docs'), True, True, self.path('cache')), [])
+        copy_directory(self.path('static'), self.path('expected'))
+        generate_pages_recursive(self.path('content'), self.path('template.html'), self.path('expected'), '/')
+        minify_outputs(self.path('expected'), None)
+        compress_outputs(self.path('expected'))
+        for relative in ('index.css', 'index.css.gz', os.path.join('page0', 'index.html')):
+            with open(self.path('docs', relative), 'rb') as merged, open(self.path('expected', relative), 'rb') as expected:
+                self.assertEqual(merged.read(), expected.read())
+
+    def test_missing_and_duplicate_shards(self):
+        first = self.render(1, 3)
+        third = self.render(3, 3)
+        problems = merge_shards([first, third, third], self.path('static'), self.path('docs'))
+        self.assertIn("shard 2/3 is missing", problems)
+        self.assertIn(f"{third}: shard 3/3 already merged from {third}", problems)
+        self.assertFalse(os.path.exists(self.path('docs')))
+
+    def test_failed_pages_block_the_merge(self):
+        self.write(self.path('content', 'page0', 'index.md'), "no title")
+        shard_dirs = [self.render(index, 2) for index in (1, 2)]
+        problems = merge_shards(shard_dirs, self.path('static'), self.path('docs'))
+        self.assertEqual(len(problems), 1)
+        self.assertIn("page0/index.md failed to render", problems[0])
+
+    def test_shards_of_different_trees(self):
+        first = self.render(1, 2)
+        self.write(self.path('content', 'extra', 'index.md'), "# Extra")
+        second = self.render(2, 2)
+        problems = merge_shards([first, second], self.path('static'), self.path('docs'))
+        self.assertIn(f"{second}: discovered differs from {first}", problems)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+import htmlnode
+from htmlnode import stream_page, render_page, render_page_file
+from render import RenderContext
+from template import Template
+from buildtrace import start_tracing, stop_tracing, slowest_pages
+from sitetest import SiteTestCase
+
+MARKDOWN = """Intro before the title with [a link](/intro)
+
+# The **Title**
+
+> quoted
+
+```
+code
+
+with blank lines
+```
+
+- one
+- [two](/two)
+"""
+
+class TestStreamingPage(unittest.TestCase):
+
+    def test_matches_in_memory_render(self):
+        template = Template("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        out = []
+        stream_page(iter(MARKDOWN.splitlines(True)), RenderContext('/base/'), template)(out)
+        self.assertEqual("".join(out), render_page(MARKDOWN, template, '/base/'))
+
+    def test_reads_lazily(self):
+        consumed = []
+        def lines():
+            for line in ["# Title\n", "\n", "body\n"]:
+                consumed.append(line)
+                yield line
+        write_page_to = stream_page(lines(), RenderContext(), Template("{{ Content }}"))
+        self.assertEqual(consumed, ["# Title\n", "\n"])
+        out = []
+        write_page_to(out)
+        self.assertEqual("".join(out), "<div><h1 id=\"title\">Title</h1>\n<p>body</p>\n</div>\n")
+
+    def test_missing_title(self):
+        with self.assertRaises(Exception):
+            stream_page(iter(["just text\n"]), RenderContext(), Template("{{ Content }}"))
+
+    def test_title_search_is_bounded(self):
+        consumed = []
+        def lines():
+            for number in range(1000):
+                for line in (f"paragraph {number}\n", "\n"):
+                    consumed.append(line)
+                    yield line
+        limit = htmlnode.STREAMING_TITLE_LIMIT
+        htmlnode.STREAMING_TITLE_LIMIT = 100
+        try:
+            with self.assertRaises(Exception):
+                stream_page(lines(), RenderContext(), Template("{{ Content }}"))
+        finally:
+            htmlnode.STREAMING_TITLE_LIMIT = limit
+        self.assertLess(len(consumed), 40)
+
+class TestStreamedFiles(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.threshold = htmlnode.STREAMING_THRESHOLD
+        self.write(self.path('index.md'), MARKDOWN)
+
+    def tearDown(self):
+        stop_tracing()
+        htmlnode.STREAMING_THRESHOLD = self.threshold
+        super().tearDown()
+
+    def read(self, *parts):
+        with open(self.path(*parts), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_large_files_are_streamed(self):
+        self.write(self.path('template.html'), "{{ Title }}|{{ Date }}|{{ Content }}")
+        for markdown in (MARKDOWN, "---\ntitle: Front\ndate: 2024-01-01\n---\n" + MARKDOWN):
+            self.write(self.path('index.md'), markdown)
+            htmlnode.STREAMING_THRESHOLD = 0
+            render_page_file(self.path('index.md'), self.path('template.html'), self.path('streamed.html'), '/')
+            htmlnode.STREAMING_THRESHOLD = self.threshold
+            render_page_file(self.path('index.md'), self.path('template.html'), self.path('buffered.html'), '/')
+            self.assertEqual(self.read('streamed.html'), self.read('buffered.html'))
+
+    def test_streamed_pages_are_profiled(self):
+        self.write(self.path('template.html'), "{{ Content }}")
+        htmlnode.STREAMING_THRESHOLD = 0
+        start_tracing()
+        render_page_file(self.path('index.md'), self.path('template.html'), self.path('index.html'), '/')
+        [page] = slowest_pages(stop_tracing())
+        self.assertEqual(page[4]['chars_out'], len(self.read('index.html')))
+        self.assertEqual(page[4]['chars_in'], len(MARKDOWN))
+        self.assertTrue(page[4]['streamed'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import unittest
+
+from sync import sync_directory
+from sitetest import SiteTestCase
+
+class TestSyncDirectory(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, 'static')
+        self.docs = os.path.join(self.root, 'docs')
+        self.write(os.path.join(self.static, 'index.css'), "body {}")
+        self.write(os.path.join(self.static, 'images', 'a.png'), "png data")
+
+    def read(self, *parts):
+        with open(os.path.join(self.docs, *parts), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_copies_and_skips_unchanged(self):
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('images', 'a.png'), "png data")
+        dest = os.path.join(self.docs, 'index.css')
+        inode = os.stat(dest).st_ino
+        sync_directory(self.static, self.docs)
+        self.assertEqual(os.stat(dest).st_ino, inode)
+
+    def test_changed_file_is_recopied(self):
+        sync_directory(self.static, self.docs)
+        self.write(os.path.join(self.static, 'index.css'), "body { color: red }")
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('index.css'), "body { color: red }")
+
+    def test_same_size_different_content(self):
+        sync_directory(self.static, self.docs)
+        source = os.path.join(self.static, 'index.css')
+        self.write(source, "body {{")
+        os.utime(source, ns=(1, 1))
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('index.css'), "body {{")
+
+    def test_outputs_rewritten_after_placement_are_kept(self):
+        # --minify rewrites docs/index.css after the sync; that is no reason to copy it again
+        sync_directory(self.static, self.docs)
+        self.write(os.path.join(self.docs, 'index.css'), "body{}")
+        source = os.path.join(self.static, 'index.css')
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('index.css'), "body{}")
+        # Neither is a new mtime on an unchanged source, as after a fresh checkout
+        os.utime(source, ns=(1, 1))
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('index.css'), "body{}")
+        self.write(source, "body { margin: 0 }")
+        sync_directory(self.static, self.docs)
+        self.assertEqual(self.read('index.css'), "body { margin: 0 }")
+
+    def test_removed_asset_is_deleted_but_pages_are_kept(self):
+        self.write(os.path.join(self.docs, 'index.html'), "page")
+        sync_directory(self.static, self.docs)
+        shutil.rmtree(os.path.join(self.static, 'images'))
+        sync_directory(self.static, self.docs)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, 'images')))
+        self.assertEqual(self.read('index.html'), "page")
+
+    def test_hardlink_mode(self):
+        sync_directory(self.static, self.docs, 'hardlink')
+        self.assertTrue(os.path.samefile(os.path.join(self.static, 'index.css'), os.path.join(self.docs, 'index.css')))
+
+    def test_reflink_mode(self):
+        sync_directory(self.static, self.docs, 'reflink')
+        self.assertEqual(self.read('index.css'), "body {}")
+        self.assertFalse(os.path.samefile(os.path.join(self.static, 'index.css'), os.path.join(self.docs, 'index.css')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from template import Template, load_template, parse_layout, select_template
+
+class TestTemplate(unittest.TestCase):
+
+    def test_segments_and_slots(self):
+        template = Template("<title>{{ Title }}</title>{{Content}}<p>{{ Title }}</p>")
+        self.assertEqual(template.slots(), ["Title", "Content", "Title"])
+        self.assertEqual(template.segments[0], "<title>")
+        self.assertEqual(template.segments[-1], "</p>")
+
+    def test_render_values_and_callables(self):
+        template = Template("<h1>{{ Title }}</h1>{{ Content }}")
+        out = []
+        template.render({"Title": "Hi", "Content": lambda write: write("<p>body</p>")}, out)
+        self.assertEqual("".join(out), "<h1>Hi</h1><p>body</p>")
+
+    def test_unknown_placeholder_kept(self):
+        out = []
+        Template("{{ Title }} {{ Missing }}").render({"Title": "T"}, out)
+        self.assertEqual("".join(out), "T {{ Missing }}")
+
+    def test_load_template_cache(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'template.html')
+            with open(path, 'w') as f:
+                f.write("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(first, load_template(path))
+            with open(path, 'w') as f:
+                f.write("{{ Content }}")
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(load_template(path).slots(), ["Content"])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_select_template(self):
+        layouts = [parse_layout("blog/**=blog.html"), parse_layout("contact/*=contact.html")]
+        self.assertEqual(select_template(os.path.join("blog", "tom", "index.md"), "template.html", layouts), "blog.html")
+        self.assertEqual(select_template("contact/index.md", "template.html", layouts), "contact.html")
+        self.assertEqual(select_template("index.md", "template.html", layouts), "template.html")
+
+    def test_parse_layout_rejects_missing_template(self):
+        with self.assertRaises(ValueError):
+            parse_layout("blog/**")
+
+if __name__ == "__main__":
+    unittest.main()
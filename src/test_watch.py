@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from watch import SiteBuilder, PollingWatcher
+from sitetest import SiteTestCase
+
+TEMPLATE = "<title>{{ Title }}</title><body>{{ Content }}</body>"
+
+class TestSiteBuilder(SiteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write(self.path('template.html'), TEMPLATE)
+        self.write(self.path('content', 'index.md'), "# Home")
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Post")
+        self.write(self.path('static', 'index.css'), "body {}")
+        self.builder = SiteBuilder(self.path('content'), self.path('static'), self.path('template.html'),
+                                   self.path('docs'), '/', [])
+        self.builder.build()
+
+    def read(self, *parts):
+        with open(self.path('docs', *parts), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def test_changed_page_only(self):
+        os.utime(self.path('docs', 'index.html'), ns=(0, 0))
+        self.write(self.path('content', 'blog', 'post', 'index.md'), "# Edited")
+        self.builder.apply({self.path('content', 'blog', 'post', 'index.md')})
+        self.assertIn("<title>Edited</title>", self.read('blog', 'post', 'index.html'))
+        self.assertEqual(os.stat(self.path('docs', 'index.html')).st_mtime_ns, 0)
+
+    def test_removed_page_and_asset(self):
+        os.unlink(self.path('content', 'index.md'))
+        os.unlink(self.path('static', 'index.css'))
+        self.builder.apply({self.path('content', 'index.md'), self.path('static', 'index.css')})
+        self.assertFalse(os.path.exists(self.path('docs', 'index.html')))
+        self.assertFalse(os.path.exists(self.path('docs', 'index.css')))
+
+    def test_removed_directory(self):
+        shutil.rmtree(self.path('content', 'blog'))
+        self.builder.apply({self.path('content', 'blog')})
+        self.assertFalse(os.path.exists(self.path('docs', 'blog')))
+
+    def test_template_change_rerenders(self):
+        self.write(self.path('template.html'), "<h>{{ Title }}</h>{{ Content }}")
+        self.builder.apply({self.path('template.html')})
+        self.assertTrue(self.read('index.html').startswith("<h>Home</h>"))
+
+class TestPollingWatcher(unittest.TestCase):
+
+    def test_detects_changes(self):
+        root = tempfile.mkdtemp()
+        try:
+            path = os.path.join(root, 'page.md')
+            with open(path, 'w') as f:
+                f.write("a")
+            watcher = PollingWatcher([root], [], 0.01)
+            with open(path, 'w') as f:
+                f.write("bb")
+            self.assertEqual(watcher.wait(), {path})
+        finally:
+            shutil.rmtree(root)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from htmlnode import generate_page, page_destination
+from incremental import generate_pages_incremental, remove_output
+from sync import sync_directory, place_file
+from template import parse_layout, select_template
+
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_SCRIPT = """<script>
+(function poll(version) {
+  fetch('""" + LIVE_RELOAD_PATH + """' + (version === null ? '' : '?version=' + version))
+    .then(function (response) { return response.text(); })
+    .then(function (current) {
+      if (version !== null && current !== version) { location.reload(); } else { poll(current); }
+    })
+    .catch(function () { setTimeout(function () { poll(version); }, 1000); });
+})(null);
+</script>
+"""
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')
+
+def is_within(path, directory):
+    return path == directory or path.startswith(directory + os.sep)
+
+def walk_files(directory):
+    for root, dirs, names in os.walk(directory):
+        for name in names:
+            yield os.path.join(root, name)
+
+def snapshot_files(directories, files):
+    state = {}
+    for path in [path for directory in directories for path in walk_files(directory)] + list(files):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+class PollingWatcher:
+    def __init__(self, directories, files, interval):
+        self.directories = directories
+        self.files = files
+        self.interval = interval
+        self.state = snapshot_files(directories, files)
+
+    def wait(self):
+        while True:
+            time.sleep(self.interval)
+            state = snapshot_files(self.directories, self.files)
+            changed = {path for path in state.keys() | self.state.keys() if state.get(path) != self.state.get(path)}
+            self.state = state
+            if changed:
+                return changed
+
+class InotifyWatcher:
+    def __init__(self, directories, files, settle):
+        libc_name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is None or not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.settle = settle
+        self.files = set(files)
+        # Watch descriptor -> (directory, whether everything below it is watched)
+        self.watches = {}
+        for directory in directories:
+            self.add_tree(directory)
+        for path in files:
+            self.add_watch(os.path.dirname(path) or '.', False)
+
+    def add_watch(self, directory, recursive):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        previous = self.watches.get(wd)
+        self.watches[wd] = (directory, recursive or (previous is not None and previous[1]))
+
+    def add_tree(self, directory):
+        for root, dirs, names in os.walk(directory):
+            self.add_watch(root, True)
+
+    def read_events(self):
+        data = os.read(self.fd, 1 << 16)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if wd not in self.watches:
+                continue
+            directory, recursive = self.watches[wd]
+            path = os.path.normpath(os.path.join(directory, os.fsdecode(name)))
+            if mask & IN_ISDIR:
+                if not recursive:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files can land in a new directory before its watch exists, so report them all
+                    self.add_tree(path)
+                    changed.update(walk_files(path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    changed.add(path)
+            elif mask & IN_CREATE:
+                # The matching IN_CLOSE_WRITE reports the file once it has been written
+                continue
+            elif recursive or path in self.files:
+                changed.add(path)
+        return changed
+
+    def wait(self):
+        changed = set()
+        while not changed:
+            select.select([self.fd], [], [])
+            changed |= self.read_events()
+        # A single save often produces several events; collect the ones that follow closely
+        while select.select([self.fd], [], [], self.settle)[0]:
+            changed |= self.read_events()
+        return changed
+
+def make_watcher(directories, files, interval, poll):
+    if not poll:
+        try:
+            return InotifyWatcher(directories, files, min(interval, 0.02))
+        except OSError as e:
+            print(f"Falling back to polling: {e}")
+    return PollingWatcher(directories, files, interval)
+
+class SiteBuilder:
+    def __init__(self, dir_path_content, static_path, template_path, dest_dir_path, basepath, layouts):
+        self.content = os.path.normpath(dir_path_content)
+        self.static = os.path.normpath(static_path)
+        self.template = os.path.normpath(template_path)
+        self.dest = os.path.normpath(dest_dir_path)
+        self.basepath = basepath
+        self.layouts = [(pattern, os.path.normpath(layout_path)) for pattern, layout_path in layouts]
+
+    def templates(self):
+        return {self.template} | {layout_path for pattern, layout_path in self.layouts}
+
+    def build_pages(self):
+        return generate_pages_incremental(self.content, self.template, self.dest, self.basepath, 1, self.layouts)
+
+    def build(self):
+        sync_directory(self.static, self.dest)
+        return self.build_pages()
+
+    def render_page(self, path):
+        if os.path.isfile(path):
+            dest = page_destination(path, self.content, self.dest)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            page_template = select_template(os.path.relpath(path, self.content), self.template, self.layouts)
+            generate_page(path, page_template, dest, self.basepath)
+            return True
+        dest = page_destination(path, self.content, self.dest)
+        if os.path.isfile(dest):
+            remove_output(dest, self.dest)
+            return True
+        return False
+
+    def copy_asset(self, path):
+        dest = os.path.join(self.dest, os.path.relpath(path, self.static))
+        if os.path.isfile(path):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            place_file(path, dest, 'copy')
+            return True
+        if os.path.isfile(dest):
+            remove_output(dest, self.dest)
+            return True
+        return False
+
+    def apply(self, changed):
+        if changed & self.templates():
+            print("Template changed, rerendering pages")
+            self.build_pages()
+            changed = {path for path in changed if not is_within(path, self.content)}
+        resync_content = False
+        resync_static = False
+        for path in sorted(changed):
+            try:
+                if is_within(path, self.content):
+                    resync_content = not self.render_page(path) or resync_content
+                elif is_within(path, self.static):
+                    resync_static = not self.copy_asset(path) or resync_static
+            except Exception as e:
+                print(f"Failed to rebuild {path}: {e}")
+        # Removed directories cannot be mapped to single outputs; the manifests know what they held
+        if resync_static:
+            sync_directory(self.static, self.dest)
+        if resync_content:
+            self.build_pages()
+
+class ReloadSignal:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, seen, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != seen, timeout)
+            return self.version
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, reload_signal=None, **kwargs):
+        self.reload_signal = reload_signal
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == LIVE_RELOAD_PATH:
+            self.send_live_reload(parse_qs(url.query).get('version'))
+            return
+        path = self.translate_path(url.path)
+        if os.path.isdir(path) and url.path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            self.send_page(path)
+            return
+        super().do_GET()
+
+    def send_live_reload(self, seen):
+        if seen is None:
+            version = self.reload_signal.version
+        else:
+            version = self.reload_signal.wait(int(seen[0]), 25)
+        self.send_body(str(version).encode('utf-8'), 'text/plain; charset=utf-8')
+
+    def send_page(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            page = f.read()
+        position = page.rfind('</body>')
+        if position == -1:
+            page += LIVE_RELOAD_SCRIPT
+        else:
+            page = page[:position] + LIVE_RELOAD_SCRIPT + page[position:]
+        self.send_body(page.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.path.startswith(LIVE_RELOAD_PATH):
+            super().log_message(format, *args)
+
+def serve(directory, port, reload_signal):
+    def handler(*args, **kwargs):
+        return DevRequestHandler(*args, directory=directory, reload_signal=reload_signal, **kwargs)
+    server = ThreadingHTTPServer(('localhost', port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild ./docs on changes and serve it with live reload")
+    parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--interval', type=float, default=0.1,
+                        help="seconds between scans when polling for changes")
+    parser.add_argument('--poll', action='store_true',
+                        help="poll for changes even when inotify is available")
+    parser.add_argument('--layout', action='append', default=[], type=parse_layout, metavar='PATTERN=TEMPLATE',
+                        help="render content files matching PATTERN (e.g. 'blog/**') with TEMPLATE instead of template.html")
+    args = parser.parse_args()
+
+    builder = SiteBuilder('./content', './static', 'template.html', './docs', '/', args.layout)
+    builder.build()
+
+    reload_signal = ReloadSignal()
+    server = serve(builder.dest, args.port, reload_signal)
+    watcher = make_watcher([builder.content, builder.static], sorted(builder.templates()), args.interval, args.poll)
+    print(f"Serving {builder.dest} at http://localhost:{args.port}/ and watching for changes")
+
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            builder.apply(changed)
+            reload_signal.notify()
+            print(f"Rebuilt {len(changed)} changed file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()